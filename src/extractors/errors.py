@@ -0,0 +1,75 @@
+import http.client
+import socket
+import ssl
+import urllib.error
+from typing import Dict
+
+PARSE_ERROR = "parse_error"
+UNSUPPORTED = "unsupported"
+TIMEOUT = "timeout"
+UPSTREAM_ERROR = "upstream_error"
+CIRCUIT_OPEN = "circuit_open"
+INTERNAL_ERROR = "internal_error"
+
+# Failures that say nothing about the URL itself and are worth retrying later.
+# Internal errors are bugs on our side, so a later run may well succeed.
+RETRYABLE_CATEGORIES = frozenset({TIMEOUT, UPSTREAM_ERROR, CIRCUIT_OPEN, INTERNAL_ERROR})
+
+class ExtractionError(Exception):
+    """
+    Base class for failures raised by extractors. Subclasses set 'category',
+    which is recorded in the error record and drives circuit breaking.
+    """
+
+    category = INTERNAL_ERROR
+
+class ParseError(ExtractionError):
+    """The URL or the upstream response could not be understood."""
+
+    category = PARSE_ERROR
+
+class UnsupportedError(ExtractionError):
+    """The URL points at content the extractor does not handle."""
+
+    category = UNSUPPORTED
+
+class ExtractionTimeout(ExtractionError):
+    """The upstream platform did not answer in time."""
+
+    category = TIMEOUT
+
+class UpstreamError(ExtractionError):
+    """The upstream platform answered with an error or was unreachable."""
+
+    category = UPSTREAM_ERROR
+
+# Standard library exceptions that reliably mean a network problem, checked
+# in order. Anything else that is not an ExtractionError is treated as a bug
+# (internal_error).
+_BUILTIN_CATEGORIES: Dict[type, str] = {
+    TimeoutError: TIMEOUT,
+    socket.timeout: TIMEOUT,
+    ConnectionError: UPSTREAM_ERROR,
+    urllib.error.URLError: UPSTREAM_ERROR,
+    http.client.HTTPException: UPSTREAM_ERROR,
+    socket.gaierror: UPSTREAM_ERROR,
+    ssl.SSLError: UPSTREAM_ERROR,
+}
+
+def classify_exception(exc: BaseException) -> str:
+    """
+    Maps an exception to a failure category. Extractors should raise
+    ExtractionError subclasses; standard library timeouts and network errors
+    are mapped too, and anything else is an internal error.
+    """
+    if isinstance(exc, ExtractionError):
+        return exc.category
+    if isinstance(exc, urllib.error.URLError) and isinstance(exc.reason, BaseException):
+        # urlopen wraps socket errors, e.g. URLError(reason=timeout()).
+        reason = classify_exception(exc.reason)
+        if reason != INTERNAL_ERROR:
+            return reason
+    for exc_type, category in _BUILTIN_CATEGORIES.items():
+        if isinstance(exc, exc_type):
+            return category
+    return INTERNAL_ERROR
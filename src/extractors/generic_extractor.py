@@ -0,0 +1,66 @@
+import logging
+from typing import Any, Dict, Optional
+from urllib.parse import urlparse
+
+from extractors.errors import ParseError, UnsupportedError
+from extractors.media_selection import SELECT_ALL, MediaSelection
+
+logger = logging.getLogger(__name__)
+
+class GenericExtractor:
+    """
+    Fallback extractor when there is no platform-specific implementation.
+    Generates a structured record with minimal, deterministic metadata.
+    """
+
+    source_name = "generic"
+
+    def __init__(self, source_name: Optional[str] = None) -> None:
+        if source_name:
+            self.source_name = source_name
+
+    def extract(
+        self, url: str, selection: Optional[MediaSelection] = None
+    ) -> Dict[str, Any]:
+        logger.debug("Extracting %s URL with generic extractor: %s", self.source_name, url)
+        selection = selection or SELECT_ALL
+        self._check_supported(url)
+        title = f"Media from {self.source_name}"
+        variants = [{"quality": "original", "extension": "bin", "type": "multiple"}]
+        medias = [{"url": url, **variant} for variant in selection.select(variants)]
+        record = {
+            "url": url,
+            "source": self.source_name,
+            "author": self._guess_author(url),
+            "title": title,
+            "thumbnail": "",
+            "duration": 0,
+            "medias": medias,
+            "type": "multiple",
+            "error": False,
+        }
+        return record
+
+    def parse_id(self, url: str) -> str:
+        return url
+
+    @staticmethod
+    def _check_supported(url: str) -> None:
+        try:
+            parsed = urlparse(url)
+        except ValueError as exc:
+            raise ParseError(f"Malformed URL {url!r}: {exc}") from exc
+        if parsed.scheme not in {"http", "https"} or not parsed.hostname:
+            raise UnsupportedError(f"Not a web URL: {url!r}")
+
+    @staticmethod
+    def _guess_author(url: str) -> str:
+        # Very naive guess based on path segments.
+        try:
+            parts = url.split("/")
+            for part in parts:
+                if "@" in part and len(part) > 1:
+                    return part.strip("@")
+        except Exception:
+            pass
+        return "unknown"
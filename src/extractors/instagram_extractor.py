@@ -1,8 +1,11 @@
 thonimport hashlib
 import logging
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 from urllib.parse import urlparse
 
+from extractors.errors import ParseError
+from extractors.media_selection import SELECT_ALL, MediaSelection
+
 logger = logging.getLogger(__name__)
 
 class InstagramExtractor:
@@ -12,23 +15,33 @@ class InstagramExtractor:
     """
 
     source_name = "instagram"
+    hosts = ("instagram.com", "instagr.am")
 
-    def extract(self, url: str) -> Dict[str, Any]:
+    def extract(
+        self, url: str, selection: Optional[MediaSelection] = None
+    ) -> Dict[str, Any]:
         logger.debug("Extracting Instagram URL: %s", url)
+        selection = selection or SELECT_ALL
         shortcode = self._shortcode_from_url(url)
         author = self._extract_author(url)
         title = f"Instagram post {shortcode} by {author}"
 
         is_slideshow = self._is_slideshow(shortcode)
         if is_slideshow:
-            medias = self._build_slideshow_medias(shortcode)
+            variants = self._slideshow_variants()
             media_type = "multiple"
             duration_ms = 0
         else:
-            medias = self._build_single_media(shortcode)
+            variants = self._single_variants()
             media_type = "image"
             duration_ms = 0
 
+        medias = [
+            self._build_media(shortcode, variant)
+            for variant in selection.select(variants)
+        ]
+        media_type = selection.record_type(medias, media_type)
+
         thumbnail = f"https://dummy.instagramcdn.com/p/{shortcode}/thumbnail.jpg"
 
         record = {
@@ -45,9 +58,15 @@ class InstagramExtractor:
         logger.debug("Instagram extraction result: %s", record)
         return record
 
+    def parse_id(self, url: str) -> str:
+        return self._shortcode_from_url(url)
+
     @staticmethod
     def _shortcode_from_url(url: str) -> str:
-        parsed = urlparse(url)
+        try:
+            parsed = urlparse(url)
+        except ValueError as exc:
+            raise ParseError(f"Malformed URL {url!r}: {exc}") from exc
         parts = [p for p in parsed.path.split("/") if p]
         if len(parts) >= 2 and parts[0] in {"p", "reel"}:
             return parts[1]
@@ -69,26 +88,21 @@ class InstagramExtractor:
         return int(shortcode[:2], 16) % 2 == 0 if shortcode else False
 
     @staticmethod
-    def _build_slideshow_medias(shortcode: str) -> List[Dict[str, Any]]:
-        medias: List[Dict[str, Any]] = []
-        for idx in range(3):
-            medias.append(
-                {
-                    "url": f"https://dummy.instagramcdn.com/p/{shortcode}/image_{idx+1}.jpg",
-                    "quality": "standard",
-                    "extension": "jpg",
-                    "type": "image",
-                }
-            )
-        return medias
+    def _slideshow_variants() -> List[Dict[str, Any]]:
+        return [
+            {"name": f"image_{idx+1}", "quality": "standard", "extension": "jpg", "type": "image"}
+            for idx in range(3)
+        ]
 
     @staticmethod
-    def _build_single_media(shortcode: str) -> List[Dict[str, Any]]:
-        return [
-            {
-                "url": f"https://dummy.instagramcdn.com/p/{shortcode}/image.jpg",
-                "quality": "standard",
-                "extension": "jpg",
-                "type": "image",
-            }
-        ]
\ No newline at end of file
+    def _single_variants() -> List[Dict[str, Any]]:
+        return [{"name": "image", "quality": "standard", "extension": "jpg", "type": "image"}]
+
+    @staticmethod
+    def _build_media(shortcode: str, variant: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "url": f"https://dummy.instagramcdn.com/p/{shortcode}/{variant['name']}.jpg",
+            "quality": variant["quality"],
+            "extension": variant["extension"],
+            "type": variant["type"],
+        }
\ No newline at end of file
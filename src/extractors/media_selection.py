@@ -0,0 +1,171 @@
+import logging
+import re
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from extractors.errors import UnsupportedError
+
+logger = logging.getLogger(__name__)
+
+_MEDIA_TYPES = {"video", "audio", "image"}
+_KNOWN_TERMS = {"all", "best"} | _MEDIA_TYPES
+_HEIGHT_PATTERN = re.compile(r"(\d{3,4})p")
+_MAX_PATTERN = re.compile(r"^max[:=]?(\d{3,4})p?$")
+
+class MediaSelection:
+    """
+    Declarative policy deciding which media variants an extractor emits.
+
+    A policy is described by a short spec string made of comma-separated
+    clauses. A clause is either a '+'-joined list of terms or a height cap:
+
+    - ``all``: keep every variant (the default).
+    - ``best``: keep only the highest quality video variant. Records without
+      video keep their images and other non-audio items, since those are
+      distinct items rather than variants of each other.
+    - ``video`` / ``audio`` / ``image``: keep every variant of that type.
+    - ``max:720p``: drop video variants taller than the given height. When
+      every video is taller, the smallest one is kept instead.
+
+    Variants of any other type, such as the generic extractor's
+    ``multiple``, say nothing about what they contain and are always kept.
+
+    A policy that matches none of a record's variants raises
+    UnsupportedError, so the URL is reported as a failed record instead of
+    silently producing one without medias.
+
+    Examples: ``"best+audio"``, ``"audio"``, ``"best,max:720p"``.
+    """
+
+    def __init__(
+        self,
+        terms: Optional[Iterable[str]] = None,
+        max_height: Optional[int] = None,
+    ) -> None:
+        self.terms: Set[str] = set(terms or {"all"})
+        self.max_height = max_height
+
+    @classmethod
+    def parse(cls, spec: Optional[str]) -> "MediaSelection":
+        if not spec:
+            return cls()
+
+        terms: Set[str] = set()
+        max_height: Optional[int] = None
+
+        for clause in spec.lower().replace(" ", "").split(","):
+            if not clause:
+                continue
+            match = _MAX_PATTERN.match(clause)
+            if match:
+                max_height = int(match.group(1))
+                continue
+            for term in clause.split("+"):
+                if term not in _KNOWN_TERMS:
+                    raise ValueError(
+                        f"Unknown media selection term '{term}' in '{spec}'. "
+                        f"Expected one of: {', '.join(sorted(_KNOWN_TERMS))} "
+                        f"or a cap like 'max:720p'."
+                    )
+                terms.add(term)
+
+        return cls(terms or {"all"}, max_height)
+
+    @property
+    def keeps_everything(self) -> bool:
+        return "all" in self.terms and self.max_height is None
+
+    def select(self, variants: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Returns the subset of variant descriptors accepted by this policy, in
+        their original order. Descriptors only need 'quality' and 'type'
+        keys, so extractors can select before building full media entries.
+        """
+        if self.keeps_everything:
+            return list(variants)
+
+        candidates = [v for v in variants if self._within_height_cap(v)]
+        if not any(v.get("type") == "video" for v in candidates) and (
+            self.terms & {"all", "best", "video"}
+        ):
+            # Every video is above the height cap: fall back to the smallest.
+            over_cap = [v for v in variants if v.get("type") == "video"]
+            if over_cap:
+                lowest = min(over_cap, key=self._quality_rank)
+                logger.debug(
+                    "No video within %sp; falling back to %s",
+                    self.max_height,
+                    lowest.get("quality"),
+                )
+                candidates = [v for v in variants if v is lowest or v in candidates]
+
+        if "all" in self.terms:
+            return self._require_match(candidates, variants)
+
+        videos = [v for v in candidates if v.get("type") == "video"]
+        chosen: List[Dict[str, Any]] = []
+
+        best_video: Optional[Dict[str, Any]] = None
+        if "best" in self.terms and videos:
+            best_video = max(videos, key=self._quality_rank)
+
+        for variant in candidates:
+            media_type = variant.get("type")
+            if media_type in self.terms or media_type not in _MEDIA_TYPES:
+                chosen.append(variant)
+            elif variant is best_video:
+                chosen.append(variant)
+            elif "best" in self.terms and not videos and media_type != "audio":
+                chosen.append(variant)
+
+        logger.debug(
+            "Media selection kept %d of %d variant(s)", len(chosen), len(variants)
+        )
+        return self._require_match(chosen, variants)
+
+    def _require_match(
+        self, chosen: List[Dict[str, Any]], variants: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        if variants and not chosen:
+            kinds = ", ".join(sorted({str(v.get("type")) for v in variants}))
+            raise UnsupportedError(
+                f"Media selection {self!r} matched none of the {len(variants)} "
+                f"available variant(s) ({kinds})."
+            )
+        return chosen
+
+    def record_type(self, medias: List[Dict[str, Any]], default: str) -> str:
+        """
+        Returns the record-level type for the selected medias. When a policy
+        narrows a record down to a single kind of media, the record reports
+        that kind instead of the extractor's default.
+        """
+        if self.keeps_everything or not medias:
+            return default
+        kinds = {m.get("type") for m in medias}
+        if len(kinds) == 1:
+            return kinds.pop() or default
+        return default
+
+    def _within_height_cap(self, variant: Dict[str, Any]) -> bool:
+        if self.max_height is None or variant.get("type") != "video":
+            return True
+        height = _height_from_quality(variant.get("quality"))
+        return height is None or height <= self.max_height
+
+    @staticmethod
+    def _quality_rank(variant: Dict[str, Any]) -> tuple:
+        quality = (variant.get("quality") or "").lower()
+        height = _height_from_quality(quality) or 0
+        return (height, 1 if "hd" in quality else 0)
+
+    def __repr__(self) -> str:
+        terms = "+".join(sorted(self.terms))
+        if self.max_height is not None:
+            return f"MediaSelection({terms}, max:{self.max_height}p)"
+        return f"MediaSelection({terms})"
+
+def _height_from_quality(quality: Optional[str]) -> Optional[int]:
+    match = _HEIGHT_PATTERN.search((quality or "").lower())
+    return int(match.group(1)) if match else None
+
+SELECT_ALL = MediaSelection()
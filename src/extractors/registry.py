@@ -0,0 +1,152 @@
+import logging
+from functools import partial
+from importlib.metadata import entry_points
+from typing import Any, Callable, Dict, Iterable, Optional
+from urllib.parse import urlparse
+
+from extractors.generic_extractor import GenericExtractor
+from extractors.instagram_extractor import InstagramExtractor
+from extractors.tiktok_extractor import TikTokExtractor
+from extractors.youtube_extractor import YouTubeExtractor
+
+logger = logging.getLogger(__name__)
+
+ENTRY_POINT_GROUP = "media_downloader.extractors"
+
+class ExtractorRegistry:
+    """
+    Maps host suffixes to platform names and platform names to extractors.
+
+    Extractors are registered with the host suffixes they handle (e.g.
+    'tiktok.com' also matches 'vm.tiktok.com'). Each platform gets a single
+    cached extractor instance, created the first time it is requested, so
+    dispatching a URL is a dict lookup per host label plus one for the
+    instance.
+
+    Third-party extractors are discovered through the
+    'media_downloader.extractors' entry point group. Each entry point must
+    resolve to an extractor class (or zero-argument factory) exposing
+    'source_name', 'hosts', 'extract(url, selection)' and optionally
+    'parse_id(url)'. Entry points are only loaded on the first lookup.
+    """
+
+    def __init__(self, entry_point_group: Optional[str] = ENTRY_POINT_GROUP) -> None:
+        self._factories: Dict[str, Callable[[], Any]] = {}
+        self._hosts: Dict[str, str] = {}
+        self._instances: Dict[str, Any] = {}
+        self._entry_point_group = entry_point_group
+        self._entry_points_loaded = entry_point_group is None
+
+    def register(
+        self,
+        factory: Callable[[], Any],
+        platform: Optional[str] = None,
+        hosts: Optional[Iterable[str]] = None,
+    ) -> None:
+        """
+        Registers an extractor factory for a platform. The platform name and
+        host suffixes default to the factory's 'source_name' and 'hosts'
+        attributes. Registering an existing platform or host replaces it; a
+        replaced platform keeps its previous hosts only if the new factory
+        declares none.
+        """
+        platform = (platform or getattr(factory, "source_name", "") or "").lower()
+        if not platform:
+            raise ValueError(f"Cannot register extractor {factory!r} without a platform name.")
+
+        hosts = tuple(getattr(factory, "hosts", ()) if hosts is None else hosts)
+
+        if hosts and platform in self._factories:
+            self._hosts = {h: p for h, p in self._hosts.items() if p != platform}
+        self._factories[platform] = factory
+        self._instances.pop(platform, None)
+        for host in hosts:
+            self._hosts[host.lower().lstrip(".")] = platform
+        logger.debug("Registered extractor for %s (hosts=%s)", platform, list(hosts))
+
+    def platform_for_url(self, url: str) -> Optional[str]:
+        """
+        Returns the registered platform for a URL's host, or None when no
+        registered suffix matches.
+        """
+        try:
+            host = urlparse(url).hostname or ""
+        except Exception as exc:
+            logger.warning("Failed to parse URL %s: %s", url, exc)
+            return None
+        return self.platform_for_host(host)
+
+    def platform_for_host(self, host: str) -> Optional[str]:
+        self._ensure_entry_points()
+        labels = host.lower().rstrip(".").split(".")
+        # Try 'www.tiktok.com', then 'tiktok.com', then 'com'.
+        for idx in range(len(labels)):
+            platform = self._hosts.get(".".join(labels[idx:]))
+            if platform is not None:
+                return platform
+        return None
+
+    def get(self, platform: Optional[str]) -> Any:
+        """
+        Returns the cached extractor for a platform. Unknown platforms get a
+        cached GenericExtractor labelled with the platform name.
+        """
+        # Plugins may override built-ins, so load them before using the cache.
+        self._ensure_entry_points()
+        platform = (platform or "unknown").lower()
+        extractor = self._instances.get(platform)
+        if extractor is not None:
+            return extractor
+
+        factory = self._factories.get(platform)
+        extractor = factory() if factory is not None else GenericExtractor(platform)
+        self._instances[platform] = extractor
+        return extractor
+
+    def for_url(self, url: str) -> Any:
+        return self.get(self.platform_for_url(url))
+
+    def parse_id(self, url: str) -> str:
+        """
+        Returns the platform-specific media id for a URL using the matching
+        extractor's 'parse_id', falling back to the URL itself.
+        """
+        extractor = self.for_url(url)
+        parser = getattr(extractor, "parse_id", None)
+        return parser(url) if parser is not None else url
+
+    @property
+    def platforms(self) -> Iterable[str]:
+        self._ensure_entry_points()
+        return sorted(self._factories)
+
+    def _ensure_entry_points(self) -> None:
+        if self._entry_points_loaded:
+            return
+        self._entry_points_loaded = True
+
+        try:
+            discovered = entry_points(group=self._entry_point_group)
+        except Exception as exc:
+            logger.warning("Failed to discover extractor entry points: %s", exc)
+            return
+
+        for entry_point in discovered:
+            try:
+                factory = entry_point.load()
+                self.register(factory, platform=getattr(factory, "source_name", None) or entry_point.name)
+            except Exception as exc:
+                logger.warning("Failed to load extractor plugin %s: %s", entry_point.name, exc)
+
+def _build_default_registry() -> ExtractorRegistry:
+    registry = ExtractorRegistry()
+    registry.register(TikTokExtractor)
+    registry.register(YouTubeExtractor)
+    registry.register(InstagramExtractor)
+    # Platforms recognised by host but still handled generically.
+    registry.register(partial(GenericExtractor, "facebook"), "facebook", ("facebook.com", "fb.watch"))
+    registry.register(partial(GenericExtractor, "reddit"), "reddit", ("reddit.com",))
+    registry.register(partial(GenericExtractor, "spotify"), "spotify", ("spotify.com",))
+    return registry
+
+default_registry = _build_default_registry()
@@ -1,8 +1,11 @@
 thonimport hashlib
 import logging
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 from urllib.parse import urlparse, parse_qs
 
+from extractors.errors import ParseError
+from extractors.media_selection import SELECT_ALL, MediaSelection
+
 logger = logging.getLogger(__name__)
 
 class TikTokExtractor:
@@ -13,9 +16,13 @@ class TikTokExtractor:
     """
 
     source_name = "tiktok"
+    hosts = ("tiktok.com",)
 
-    def extract(self, url: str) -> Dict[str, Any]:
+    def extract(
+        self, url: str, selection: Optional[MediaSelection] = None
+    ) -> Dict[str, Any]:
         logger.debug("Extracting TikTok URL: %s", url)
+        selection = selection or SELECT_ALL
         video_id = self._extract_video_id(url)
         author = self._extract_author(url)
         title = f"TikTok video by {author}"
@@ -25,26 +32,14 @@ class TikTokExtractor:
             f"https://dummy.tiktokcdn.com/thumbnail/{video_id or 'unknown'}.jpg"
         )
 
+        variants = [
+            {"quality": "hd_no_watermark", "extension": "mp4", "type": "video"},
+            {"quality": "no_watermark", "extension": "mp4", "type": "video"},
+            {"quality": "audio", "extension": "mp3", "type": "audio"},
+        ]
         medias = [
-            {
-                "url": f"https://dummy.tiktokcdn.com/{video_id}_hd_no_watermark.mp4",
-                "quality": "hd_no_watermark",
-                "extension": "mp4",
-                "type": "video",
-            },
-            {
-                "url": f"https://dummy.tiktokcdn.com/{video_id}_no_watermark.mp4",
-                "quality": "no_watermark",
-                "extension": "mp4",
-                "type": "video",
-            },
-            {
-                "url": f"https://dummy.tiktokcdn.com/{video_id}_audio.mp3",
-                "duration": int(duration_ms / 1000),
-                "quality": "audio",
-                "extension": "mp3",
-                "type": "audio",
-            },
+            self._build_media(video_id, variant, duration_ms)
+            for variant in selection.select(variants)
         ]
 
         record = {
@@ -55,18 +50,44 @@ class TikTokExtractor:
             "thumbnail": base_thumbnail,
             "duration": duration_ms,
             "medias": medias,
-            "type": "multiple",
+            "type": selection.record_type(medias, "multiple"),
             "error": False,
         }
         logger.debug("TikTok extraction result: %s", record)
         return record
 
+    def parse_id(self, url: str) -> str:
+        return self._extract_video_id(url)
+
+    @staticmethod
+    def _build_media(
+        video_id: str, variant: Dict[str, Any], duration_ms: int
+    ) -> Dict[str, Any]:
+        quality = variant["quality"]
+        if variant["type"] == "audio":
+            return {
+                "url": f"https://dummy.tiktokcdn.com/{video_id}_audio.mp3",
+                "duration": int(duration_ms / 1000),
+                "quality": quality,
+                "extension": variant["extension"],
+                "type": variant["type"],
+            }
+        return {
+            "url": f"https://dummy.tiktokcdn.com/{video_id}_{quality}.mp4",
+            "quality": quality,
+            "extension": variant["extension"],
+            "type": variant["type"],
+        }
+
     @staticmethod
     def _extract_video_id(url: str) -> str:
         """
         Extracts video ID from common TikTok URL patterns.
         """
-        parsed = urlparse(url)
+        try:
+            parsed = urlparse(url)
+        except ValueError as exc:
+            raise ParseError(f"Malformed URL {url!r}: {exc}") from exc
         # Pattern: /@username/video/<id>
         parts = [p for p in parsed.path.split("/") if p]
         if "video" in parts:
@@ -1,8 +1,11 @@
 thonimport hashlib
 import logging
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 from urllib.parse import parse_qs, urlparse
 
+from extractors.errors import ParseError
+from extractors.media_selection import SELECT_ALL, MediaSelection
+
 logger = logging.getLogger(__name__)
 
 class YouTubeExtractor:
@@ -12,9 +15,13 @@ class YouTubeExtractor:
     """
 
     source_name = "youtube"
+    hosts = ("youtube.com", "youtu.be")
 
-    def extract(self, url: str) -> Dict[str, Any]:
+    def extract(
+        self, url: str, selection: Optional[MediaSelection] = None
+    ) -> Dict[str, Any]:
         logger.debug("Extracting YouTube URL: %s", url)
+        selection = selection or SELECT_ALL
         video_id = self._extract_video_id(url)
         title = f"YouTube video {video_id}"
         author = self._guess_author(video_id)
@@ -22,25 +29,20 @@ class YouTubeExtractor:
 
         thumbnail = f"https://img.youtube.com/vi/{video_id}/hqdefault.jpg"
 
+        # Each variant carries the 'fmt' token used to build its URL.
+        variants = [
+            {"fmt": "mp4_1080p", "quality": "1080p", "extension": "mp4", "type": "video"},
+            {"fmt": "mp4_720p", "quality": "720p", "extension": "mp4", "type": "video"},
+            {"fmt": "audio_mp3", "quality": "audio", "extension": "mp3", "type": "audio"},
+        ]
         medias = [
             {
-                "url": f"https://youtube.com/watch?v={video_id}&fmt=mp4_1080p",
-                "quality": "1080p",
-                "extension": "mp4",
-                "type": "video",
-            },
-            {
-                "url": f"https://youtube.com/watch?v={video_id}&fmt=mp4_720p",
-                "quality": "720p",
-                "extension": "mp4",
-                "type": "video",
-            },
-            {
-                "url": f"https://youtube.com/watch?v={video_id}&fmt=audio_mp3",
-                "quality": "audio",
-                "extension": "mp3",
-                "type": "audio",
-            },
+                "url": f"https://youtube.com/watch?v={video_id}&fmt={variant['fmt']}",
+                "quality": variant["quality"],
+                "extension": variant["extension"],
+                "type": variant["type"],
+            }
+            for variant in selection.select(variants)
         ]
 
         record = {
@@ -51,15 +53,21 @@ class YouTubeExtractor:
             "thumbnail": thumbnail,
             "duration": duration_ms,
             "medias": medias,
-            "type": "multiple",
+            "type": selection.record_type(medias, "multiple"),
             "error": False,
         }
         logger.debug("YouTube extraction result: %s", record)
         return record
 
+    def parse_id(self, url: str) -> str:
+        return self._extract_video_id(url)
+
     @staticmethod
     def _extract_video_id(url: str) -> str:
-        parsed = urlparse(url)
+        try:
+            parsed = urlparse(url)
+        except ValueError as exc:
+            raise ParseError(f"Malformed URL {url!r}: {exc}") from exc
         if parsed.netloc in {"youtu.be"}:
             # Short URL: https://youtu.be/<id>
             parts = [p for p in parsed.path.split("/") if p]
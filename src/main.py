@@ -3,60 +3,38 @@ import json
 import logging
 import sys
 from pathlib import Path
-from typing import Any, Dict, List
-
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Set
+from urllib.parse import urlparse
+
+from extractors.errors import (
+    CIRCUIT_OPEN,
+    INTERNAL_ERROR,
+    RETRYABLE_CATEGORIES,
+    classify_exception,
+)
+from extractors.media_selection import MediaSelection
+from extractors.registry import default_registry
 from extractors.utils_parser import detect_platform
-from extractors.tiktok_extractor import TikTokExtractor
-from extractors.youtube_extractor import YouTubeExtractor
-from extractors.instagram_extractor import InstagramExtractor
 from processors.watermark_remover import remove_watermarks_from_record
 from outputs.exporter_json import export_to_json
 from outputs.exporter_csv import export_to_csv
 from outputs.exporter_excel import export_to_excel
+from outputs.spill_log import (
+    RecordLog,
+    compact_spill,
+    completed_urls,
+    export_to_spill,
+    iter_latest_records,
+    merge_spills,
+)
+from pipeline.backpressure import parse_memory_size
+from pipeline.failures import CircuitBreakerBoard, FailureSummary
+from pipeline.runner import run_pipeline
 
 logger = logging.getLogger("media_downloader")
 
-class GenericExtractor:
-    """
-    Fallback extractor when there is no platform-specific implementation.
-    Generates a structured record with minimal, deterministic metadata.
-    """
-
-    source_name = "generic"
-
-    def extract(self, url: str) -> Dict[str, Any]:
-        title = f"Media from {self.source_name}"
-        record = {
-            "url": url,
-            "source": self.source_name,
-            "author": self._guess_author(url),
-            "title": title,
-            "thumbnail": "",
-            "duration": 0,
-            "medias": [
-                {
-                    "url": url,
-                    "quality": "original",
-                    "extension": "bin",
-                    "type": "multiple",
-                }
-            ],
-            "type": "multiple",
-            "error": False,
-        }
-        return record
-
-    @staticmethod
-    def _guess_author(url: str) -> str:
-        # Very naive guess based on path segments.
-        try:
-            parts = url.split("/")
-            for part in parts:
-                if "@" in part and len(part) > 1:
-                    return part.strip("@")
-        except Exception:
-            pass
-        return "unknown"
+SPILL_FILENAME = "example_output.spill"
 
 def setup_logging(verbosity: int) -> None:
     level = logging.WARNING
@@ -131,53 +109,106 @@ def load_input_urls(input_path: Path) -> List[str]:
         f"a list of objects with 'url' fields."
     )
 
-def get_extractor(platform: str):
-    platform = (platform or "").lower()
-    if platform == "tiktok":
-        return TikTokExtractor()
-    if platform == "youtube":
-        return YouTubeExtractor()
-    if platform == "instagram":
-        return InstagramExtractor()
+def get_extractor(platform: Optional[str]):
+    return default_registry.get(platform)
+
+def _failed_record(
+    url: str,
+    category: str = INTERNAL_ERROR,
+    message: str = "",
+    platform: Optional[str] = None,
+) -> Dict[str, Any]:
+    return {
+        "url": url,
+        "source": platform or detect_platform(url) or "unknown",
+        "author": "unknown",
+        "title": "Extraction failed",
+        "thumbnail": "",
+        "duration": 0,
+        "medias": [],
+        "type": "multiple",
+        "error": True,
+        "error_category": category,
+        "error_message": message,
+        "retryable": category in RETRYABLE_CATEGORIES,
+    }
 
-    extractor = GenericExtractor()
-    extractor.source_name = platform or "unknown"
-    return extractor
+def _breaker_key(url: str, platform: str) -> str:
+    # Unregistered sites are unrelated to each other, so each host gets its
+    # own breaker instead of sharing one for "unknown".
+    if platform != "unknown":
+        return platform
+    try:
+        return urlparse(url).hostname or platform
+    except ValueError:
+        return platform
+
+def extract_record(
+    url: str,
+    selection: Optional[MediaSelection] = None,
+    breakers: Optional[CircuitBreakerBoard] = None,
+) -> Dict[str, Any]:
+    platform = detect_platform(url) or "unknown"
+    breaker_key = _breaker_key(url, platform)
+
+    if breakers is not None and not breakers.allow(breaker_key):
+        logger.debug("Circuit for %s is open; skipping %s", breaker_key, url)
+        return _failed_record(
+            url, CIRCUIT_OPEN, f"Circuit breaker for {breaker_key} is open.", platform
+        )
+
+    category: Optional[str] = None
+    try:
+        logger.info("Processing URL: %s (platform=%s)", url, platform)
+        extractor = get_extractor(platform)
+        return extractor.extract(url, selection)
+    except Exception as exc:
+        category = classify_exception(exc)
+        if category == INTERNAL_ERROR:
+            logger.exception("Error processing URL %s: %s", url, exc)
+        else:
+            logger.warning("Failed to process URL %s (%s): %s", url, category, exc)
+        return _failed_record(url, category, str(exc), platform)
+    finally:
+        if breakers is not None:
+            breakers.record(breaker_key, category)
+
+def post_process_record(
+    record: Dict[str, Any], enable_watermark_removal: bool = True
+) -> Dict[str, Any]:
+    if record.get("error") or not enable_watermark_removal:
+        return record
+    try:
+        return remove_watermarks_from_record(record)
+    except Exception as exc:
+        logger.exception("Error post-processing URL %s: %s", record.get("url"), exc)
+        return _failed_record(record.get("url", ""), INTERNAL_ERROR, str(exc))
 
 def process_urls(
     urls: List[str],
     enable_watermark_removal: bool = True,
+    selection: Optional[MediaSelection] = None,
 ) -> List[Dict[str, Any]]:
-    results: List[Dict[str, Any]] = []
-
-    for url in urls:
-        try:
-            platform = detect_platform(url)
-            logger.info("Processing URL: %s (platform=%s)", url, platform or "unknown")
-            extractor = get_extractor(platform)
-            record = extractor.extract(url)
-
-            if enable_watermark_removal:
-                record = remove_watermarks_from_record(record)
-
-            results.append(record)
-        except Exception as exc:
-            logger.exception("Error processing URL %s: %s", url, exc)
-            results.append(
-                {
-                    "url": url,
-                    "source": detect_platform(url) or "unknown",
-                    "author": "unknown",
-                    "title": "Extraction failed",
-                    "thumbnail": "",
-                    "duration": 0,
-                    "medias": [],
-                    "type": "multiple",
-                    "error": True,
-                }
-            )
-
-    return results
+    return [
+        post_process_record(extract_record(url, selection), enable_watermark_removal)
+        for url in urls
+    ]
+
+def build_sinks(formats: List[str], output_dir: Path) -> Dict[str, Callable[..., Any]]:
+    exporters = {
+        "json": (export_to_json, "example_output.json"),
+        "csv": (export_to_csv, "example_output.csv"),
+        "excel": (export_to_excel, "example_output.xlsx"),
+        "spill": (export_to_spill, SPILL_FILENAME),
+    }
+    sinks: Dict[str, Callable[..., Any]] = {}
+    for fmt in formats:
+        if fmt not in exporters:
+            logger.warning("Unknown output format '%s' ignored.", fmt)
+            continue
+        exporter, filename = exporters[fmt]
+        sinks[fmt] = partial(exporter, output_path=output_dir / filename)
+    return sinks
 
 def parse_args(argv: List[str]) -> argparse.Namespace:
     paths = resolve_project_paths()
@@ -201,7 +232,62 @@ def parse_args(argv: List[str]) -> argparse.Namespace:
         "--formats",
         type=str,
         nargs="*",
-        help="Output formats (json, csv, excel). Overrides settings file.",
+        help="Output formats (json, csv, excel, spill). Overrides settings file.",
+    )
+    parser.add_argument(
+        "--select",
+        type=str,
+        help=(
+            "Media selection policy, e.g. 'best+audio', 'audio', 'best,max:720p'. "
+            "Overrides settings file."
+        ),
+    )
+    parser.add_argument(
+        "--from-spill",
+        type=str,
+        nargs="+",
+        help=(
+            "Re-export records from existing spill logs instead of extracting. "
+            "Several logs are first merged into the output spill log; for a URL "
+            "found in more than one, the record from the last log wins."
+        ),
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help=(
+            "Only extract URLs that have no record in the output spill log or whose "
+            "last attempt failed with a retryable error, append them to it, then "
+            "export every format from the log."
+        ),
+    )
+    parser.add_argument(
+        "--breaker-failure-rate",
+        type=float,
+        help=(
+            "Share of recent timeouts/upstream errors that opens a platform's "
+            "circuit breaker (0 disables breakers). Overrides settings file."
+        ),
+    )
+    parser.add_argument(
+        "--breaker-cooldown",
+        type=float,
+        help="Seconds an open circuit breaker waits before a half-open probe.",
+    )
+    parser.add_argument(
+        "--queue-size",
+        type=int,
+        help="Maximum number of in-flight items per pipeline stage. Overrides settings file.",
+    )
+    parser.add_argument(
+        "--max-memory",
+        type=str,
+        help="Memory budget such as '1GiB' or '800M'; in-flight work shrinks as RSS nears it.",
+    )
+    parser.add_argument(
+        "--pipeline-report",
+        type=str,
+        help="Write per-stage queue depths over time to this JSON file.",
     )
     parser.add_argument(
         "-v",
@@ -221,38 +307,141 @@ def main(argv: List[str]) -> int:
     config_path = paths["config_dir"] / "settings.example.json"
     settings = load_settings(config_path)
 
-    try:
-        input_path = Path(args.input)
-        urls = load_input_urls(input_path)
-    except Exception as exc:
-        logger.error("Failed to load input URLs: %s", exc)
-        return 1
-
     formats = args.formats or settings.get("default_formats", ["json"])
     formats = [fmt.lower() for fmt in formats]
 
-    logger.info("Loaded %d URL(s). Output formats: %s", len(urls), ", ".join(formats))
+    urls: List[str] = []
+    if not args.from_spill:
+        try:
+            input_path = Path(args.input)
+            urls = load_input_urls(input_path)
+        except Exception as exc:
+            logger.error("Failed to load input URLs: %s", exc)
+            return 1
+        logger.info("Loaded %d URL(s). Output formats: %s", len(urls), ", ".join(formats))
 
-    enable_watermark_removal = settings.get("enable_watermark_removal", True)
-    records = process_urls(urls, enable_watermark_removal=enable_watermark_removal)
+    try:
+        selection = MediaSelection.parse(
+            args.select or settings.get("media_selection", "all")
+        )
+    except ValueError as exc:
+        logger.error("Invalid media selection: %s", exc)
+        return 1
+    logger.info("Media selection policy: %r", selection)
+
+    try:
+        queue_size = int(
+            args.queue_size if args.queue_size is not None else settings.get("queue_size", 64)
+        )
+        if queue_size < 1:
+            raise ValueError(f"queue size must be at least 1, got {queue_size}")
+        max_memory_setting = args.max_memory or settings.get("max_memory")
+        max_memory = parse_memory_size(max_memory_setting) if max_memory_setting else None
+        if max_memory is not None and max_memory < 1:
+            raise ValueError(f"memory budget must be positive, got {max_memory_setting}")
+    except ValueError as exc:
+        logger.error("Invalid pipeline limits: %s", exc)
+        return 1
 
     output_dir = Path(args.output_dir)
     output_dir.mkdir(parents=True, exist_ok=True)
+    spill_path = output_dir / SPILL_FILENAME
+
+    breaker_settings = dict(settings.get("circuit_breaker", {}))
+    if args.breaker_failure_rate is not None:
+        breaker_settings["failure_rate"] = args.breaker_failure_rate
+        if args.breaker_failure_rate <= 0:
+            breaker_settings["enabled"] = False
+    if args.breaker_cooldown is not None:
+        breaker_settings["cooldown_seconds"] = args.breaker_cooldown
+    try:
+        breakers = CircuitBreakerBoard.from_settings(breaker_settings)
+    except TypeError as exc:
+        logger.error("Invalid circuit_breaker settings: %s", exc)
+        return 1
 
-    if "json" in formats:
-        json_path = output_dir / "example_output.json"
-        export_to_json(records, json_path)
-        logger.info("JSON exported to %s", json_path)
+    enable_watermark_removal = settings.get("enable_watermark_removal", True)
+    stages = [
+        ("extract", partial(extract_record, selection=selection, breakers=breakers)),
+        (
+            "postprocess",
+            partial(post_process_record, enable_watermark_removal=enable_watermark_removal),
+        ),
+    ]
+    sinks = build_sinks(formats, output_dir)
+    run = partial(run_pipeline, queue_size=queue_size, max_memory=max_memory)
+    failures = FailureSummary()
+
+    spill_inputs = [Path(p) for p in args.from_spill or []]
+    for path in spill_inputs:
+        if not path.exists():
+            logger.error("Spill log %s does not exist.", path)
+            return 1
 
-    if "csv" in formats:
-        csv_path = output_dir / "example_output.csv"
-        export_to_csv(records, csv_path)
-        logger.info("CSV exported to %s", csv_path)
+    try:
+        if spill_inputs:
+            # Re-export only: the log being read must not also be rewritten.
+            sinks.pop("spill", None)
+            source = spill_inputs[0]
+            if len(spill_inputs) > 1:
+                merge_spills(spill_inputs, spill_path)
+                compact_spill(spill_path)
+                source = spill_path
+            with RecordLog(source) as log:
+                logger.info("Re-exporting %d spilled record(s) from %s", len(log), source)
+                # A log from an interrupted --resume may hold superseded entries.
+                report = run(
+                    iter_latest_records(log), [], {**sinks, "failures": failures.consume}
+                )
+        elif args.resume:
+            if "spill" not in sinks:
+                logger.error("--resume requires the 'spill' output format.")
+                return 1
+            done: Set[str] = set()
+            if spill_path.exists():
+                with RecordLog(spill_path) as log:
+                    done = completed_urls(log)
+            pending = [url for url in urls if url not in done]
+            logger.info("Resuming: %d of %d URL(s) left to extract", len(pending), len(urls))
+
+            spill_sink = partial(export_to_spill, output_path=spill_path, append=True)
+            report = run(
+                pending, stages, {"spill": spill_sink, "failures": failures.consume}
+            )
+            # Retried URLs now have a newer entry; drop the superseded ones.
+            compact_spill(spill_path)
+            other_sinks = {fmt: sink for fmt, sink in sinks.items() if fmt != "spill"}
+            with RecordLog(spill_path) as log:
+                run(iter_latest_records(log, urls), [], other_sinks)
+        else:
+            report = run(urls, stages, {**sinks, "failures": failures.consume})
+    except Exception as exc:
+        logger.exception("Pipeline failed: %s", exc)
+        return 1
 
-    if "excel" in formats:
-        excel_path = output_dir / "example_output.xlsx"
-        export_to_excel(records, excel_path)
-        logger.info("Excel exported to %s", excel_path)
+    for fmt, sink in sinks.items():
+        logger.info("%s exported to %s", fmt.upper(), sink.keywords["output_path"])
+    report.log_summary()
+    failures.log_summary()
+    if breakers is not None:
+        for platform, state in breakers.states().items():
+            if state["times_opened"]:
+                logger.warning(
+                    "Circuit for %s opened %d time(s); now %s.",
+                    platform,
+                    state["times_opened"],
+                    state["state"],
+                )
+
+    if args.pipeline_report:
+        report_path = Path(args.pipeline_report)
+        report_path.parent.mkdir(parents=True, exist_ok=True)
+        with report_path.open("w", encoding="utf-8") as f:
+            report_data = report.to_dict()
+            report_data["failures"] = failures.to_dict()
+            report_data["circuit_breakers"] = breakers.states() if breakers else {}
+            json.dump(report_data, f, indent=2)
+        logger.info("Pipeline report written to %s", report_path)
 
     logger.info("Processing completed successfully.")
     return 0
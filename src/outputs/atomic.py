@@ -0,0 +1,22 @@
+import os
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterator, TextIO
+
+@contextmanager
+def atomic_write(path: Path, **open_kwargs: Any) -> Iterator[TextIO]:
+    """
+    Opens '<path>.tmp' for writing and moves it over 'path' once the block
+    completes. If the block raises (e.g. the pipeline aborted mid-stream),
+    the temporary file is removed and any previous output at 'path' is left
+    untouched.
+    """
+    path = Path(path)
+    tmp_path = path.with_name(path.name + ".tmp")
+    try:
+        with tmp_path.open("w", **open_kwargs) as f:
+            yield f
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
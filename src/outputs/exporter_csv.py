@@ -2,10 +2,29 @@ thonimport csv
 import json
 import logging
 from pathlib import Path
-from typing import Any, Dict, Iterable, List
+from typing import Any, Dict, Iterable
+
+from outputs.atomic import atomic_write
 
 logger = logging.getLogger(__name__)
 
+# Fixed column order so the schema does not depend on the first record.
+# The error_* and retryable columns are only filled for failed records.
+CSV_COLUMNS = [
+    "url",
+    "source",
+    "author",
+    "title",
+    "thumbnail",
+    "duration",
+    "type",
+    "error",
+    "medias_json",
+    "error_category",
+    "error_message",
+    "retryable",
+]
+
 def _flatten_record(record: Dict[str, Any]) -> Dict[str, Any]:
     """
     Flattens a media record to a single row, placing the medias array into
@@ -19,28 +38,21 @@ def _flatten_record(record: Dict[str, Any]) -> Dict[str, Any]:
 def export_to_csv(records: Iterable[Dict[str, Any]], output_path: Path) -> Path:
     """
     Exports extraction records as CSV, with one row per record. The medias list
-    is stored as a JSON string in the 'medias_json' column.
+    is stored as a JSON string in the 'medias_json' column. Rows are written as
+    records arrive, always with the CSV_COLUMNS header; fields outside it are
+    not exported. The file only replaces an existing output once every record
+    has been written.
     """
     output_path = Path(output_path)
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
-    flat_records: List[Dict[str, Any]] = [_flatten_record(r) for r in records]
-
-    if not flat_records:
-        # Create an empty file with headers only.
-        with output_path.open("w", encoding="utf-8", newline="") as f:
-            writer = csv.writer(f)
-            writer.writerow(["url", "source", "author", "title", "thumbnail", "duration", "type", "error", "medias_json"])
-        logger.debug("Exported empty CSV with headers to %s", output_path)
-        return output_path
-
-    fieldnames = list(flat_records[0].keys())
-
-    with output_path.open("w", encoding="utf-8", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
+    count = 0
+    with atomic_write(output_path, encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_COLUMNS, restval="", extrasaction="ignore")
         writer.writeheader()
-        for row in flat_records:
-            writer.writerow(row)
+        for record in records:
+            writer.writerow(_flatten_record(record))
+            count += 1
 
-    logger.debug("Exported %d record(s) to CSV: %s", len(flat_records), output_path)
+    logger.debug("Exported %d record(s) to CSV: %s", count, output_path)
     return output_path
\ No newline at end of file
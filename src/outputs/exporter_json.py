@@ -1,21 +1,31 @@
 thonimport json
 import logging
 from pathlib import Path
-from typing import Any, Iterable, List, Dict
+from typing import Any, Iterable, Dict
+
+from outputs.atomic import atomic_write
 
 logger = logging.getLogger(__name__)
 
 def export_to_json(records: Iterable[Dict[str, Any]], output_path: Path) -> Path:
     """
     Writes extraction records to a JSON file using UTF-8 and pretty formatting.
+    Records are written one at a time, so 'records' can be a stream that is
+    never fully held in memory. The file only replaces an existing output
+    once every record has been written.
     """
     output_path = Path(output_path)
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
-    data: List[Dict[str, Any]] = list(records)
-
-    with output_path.open("w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=4)
+    count = 0
+    with atomic_write(output_path, encoding="utf-8") as f:
+        for record in records:
+            # Matches json.dump(..., indent=4) on the whole list.
+            encoded = json.dumps(record, ensure_ascii=False, indent=4)
+            f.write("[\n    " if count == 0 else ",\n    ")
+            f.write(encoded.replace("\n", "\n    "))
+            count += 1
+        f.write("\n]" if count else "[]")
 
-    logger.debug("Exported %d record(s) to JSON: %s", len(data), output_path)
+    logger.debug("Exported %d record(s) to JSON: %s", count, output_path)
     return output_path
\ No newline at end of file
@@ -0,0 +1,321 @@
+import logging
+import mmap
+import os
+import struct
+from array import array
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, Optional, Set, Tuple
+
+import msgpack
+
+logger = logging.getLogger(__name__)
+
+# Spill log layout:
+#   <name>.spill      MAGIC, then one entry per record: a little-endian header
+#                     (uint32 payload length, uint32 URL length, uint8 status),
+#                     the UTF-8 URL and the msgpack-encoded payload.
+#   <name>.spill.idx  little-endian uint64 byte offset of every entry.
+# The URL and status live outside the payload so --resume and latest-record
+# lookups only read entry headers. Reading a record back is a slice of the
+# memory-mapped log plus a msgpack decode, which is cheaper than parsing the
+# equivalent JSON.
+
+MAGIC = b"MDSPILL2"
+INDEX_SUFFIX = ".idx"
+
+STATUS_OK = 0
+STATUS_FAILED = 1
+STATUS_RETRYABLE = 2
+
+_HEADER = struct.Struct("<IIB")
+_OFFSET = struct.Struct("<Q")
+
+def encode_record(record: Dict[str, Any]) -> bytes:
+    return msgpack.packb(record, use_bin_type=True)
+
+def decode_record(data: bytes) -> Dict[str, Any]:
+    return msgpack.unpackb(data, raw=False)
+
+def status_for_record(record: Dict[str, Any]) -> int:
+    if not record.get("error"):
+        return STATUS_OK
+    return STATUS_RETRYABLE if record.get("retryable") else STATUS_FAILED
+
+def index_path_for(log_path: Path) -> Path:
+    log_path = Path(log_path)
+    return log_path.with_name(log_path.name + INDEX_SUFFIX)
+
+class RecordLogWriter:
+    """
+    Appends encoded records to a spill log and its offset index. With
+    'append=True' an existing log is extended (used by --resume); otherwise
+    it is truncated.
+    """
+
+    def __init__(self, path: Path, append: bool = False) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.count = 0
+
+        if append and self.path.exists() and self.path.stat().st_size >= len(MAGIC):
+            _repair_index(self.path)
+            self._log = self.path.open("r+b")
+            if self._log.read(len(MAGIC)) != MAGIC:
+                self._log.close()
+                raise ValueError(f"{self.path} is not a spill log.")
+            self._log.seek(0, 2)
+            self._index = index_path_for(self.path).open("ab")
+        else:
+            self._log = self.path.open("wb")
+            self._log.write(MAGIC)
+            self._index = index_path_for(self.path).open("wb")
+
+    def write(self, record: Dict[str, Any]) -> None:
+        self.write_raw(record.get("url", ""), status_for_record(record), encode_record(record))
+
+    def write_raw(self, url: str, status: int, payload: bytes) -> None:
+        """Appends an already encoded entry, e.g. one read via RecordLog.entry."""
+        url_bytes = url.encode("utf-8")
+        offset = self._log.tell()
+        self._log.write(_HEADER.pack(len(payload), len(url_bytes), status))
+        self._log.write(url_bytes)
+        self._log.write(payload)
+        self._index.write(_OFFSET.pack(offset))
+        self.count += 1
+
+    def close(self) -> None:
+        self._log.close()
+        self._index.close()
+
+    def __enter__(self) -> "RecordLogWriter":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+class RecordLog:
+    """
+    Read-only, memory-mapped view of a spill log supporting len(), random
+    access by position and iteration. Records are decoded on access; 'url'
+    and 'status' only read the entry header.
+
+    Opening a log never modifies it. Entries written after it was opened, or
+    a trailing partial entry, are not visible.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self._file = self.path.open("rb")
+        size = os.fstat(self._file.fileno()).st_size
+        self._map: Optional[mmap.mmap] = None
+        if size > len(MAGIC):
+            self._map = mmap.mmap(self._file.fileno(), size, access=mmap.ACCESS_READ)
+        if self._file.read(len(MAGIC)) != MAGIC:
+            self.close()
+            raise ValueError(f"{self.path} is not a spill log.")
+
+        # Never repair here: another run may still be appending to the log.
+        self._offsets = _indexed_offsets(self._file, index_path_for(self.path), size)
+        if self._offsets is None:
+            logger.debug("Spill index for %s is stale; scanning the log", self.path)
+            self._offsets, _ = _scan_offsets(self._file, size)
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def __getitem__(self, position: int) -> Dict[str, Any]:
+        return decode_record(self.raw(position))
+
+    def entry(self, position: int) -> Tuple[str, int, bytes]:
+        """Returns the URL, status and encoded payload at 'position'."""
+        url_start, url_end, status, payload_end = self._locate(position)
+        return (
+            str(self._map[url_start:url_end], "utf-8"),
+            status,
+            self._map[url_end:payload_end],
+        )
+
+    def raw(self, position: int) -> bytes:
+        """Returns the encoded payload of the record at 'position'."""
+        _, url_end, _, payload_end = self._locate(position)
+        return self._map[url_end:payload_end]
+
+    def url(self, position: int) -> str:
+        url_start, url_end, _, _ = self._locate(position)
+        return str(self._map[url_start:url_end], "utf-8")
+
+    def status(self, position: int) -> int:
+        return self._locate(position)[2]
+
+    def _locate(self, position: int) -> Tuple[int, int, int, int]:
+        offset = self._offsets[position]
+        payload_size, url_size, status = _HEADER.unpack_from(self._map, offset)
+        url_start = offset + _HEADER.size
+        url_end = url_start + url_size
+        return url_start, url_end, status, url_end + payload_size
+
+    def latest_positions(self) -> Dict[str, int]:
+        """Maps every URL to the position of its most recent entry."""
+        return {self.url(position): position for position in range(len(self))}
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for position in range(len(self)):
+            yield self[position]
+
+    def close(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+    def __enter__(self) -> "RecordLog":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+def _entry_end(header: bytes, pos: int) -> int:
+    payload_size, url_size, _ = _HEADER.unpack(header)
+    return pos + _HEADER.size + url_size + payload_size
+
+def _indexed_offsets(f: BinaryIO, index_path: Path, log_size: int) -> Optional[array]:
+    """
+    Returns the offsets stored in the index if they cover the log up to
+    'log_size', or None when the index is missing or out of date.
+    """
+    if not index_path.exists():
+        return None
+    offsets = array("Q")
+    data = index_path.read_bytes()
+    offsets.frombytes(data[: len(data) // _OFFSET.size * _OFFSET.size])
+    if not offsets:
+        return offsets if log_size == len(MAGIC) else None
+    f.seek(offsets[-1])
+    header = f.read(_HEADER.size)
+    if len(header) == _HEADER.size and _entry_end(header, offsets[-1]) == log_size:
+        return offsets
+    return None
+
+def _scan_offsets(f: BinaryIO, log_size: int) -> Tuple[array, int]:
+    """
+    Walks the entry headers of a log and returns the offsets of every
+    complete entry within 'log_size', plus the end of the last one.
+    """
+    offsets = array("Q")
+    pos = len(MAGIC)
+    f.seek(pos)
+    while True:
+        header = f.read(_HEADER.size)
+        if len(header) < _HEADER.size:
+            break
+        end = _entry_end(header, pos)
+        if end > log_size:
+            break
+        offsets.append(pos)
+        pos = end
+        f.seek(pos)
+    return offsets, pos
+
+def _repair_index(log_path: Path) -> None:
+    """
+    Rebuilds the offset index when it is missing or does not match the log,
+    e.g. after an interrupted run. A trailing partial entry is truncated.
+    Only called before appending, never when reading.
+    """
+    index_path = index_path_for(log_path)
+    with Path(log_path).open("rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            return
+        log_size = os.fstat(f.fileno()).st_size
+        if _indexed_offsets(f, index_path, log_size) is not None:
+            return
+        logger.warning("Rebuilding spill index for %s", log_path)
+        offsets, end = _scan_offsets(f, log_size)
+
+    if end < log_size:
+        logger.warning("Dropping %d trailing byte(s) of a partial spill entry", log_size - end)
+        with Path(log_path).open("r+b") as f:
+            f.truncate(end)
+    index_path.write_bytes(offsets.tobytes())
+
+def export_to_spill(
+    records: Iterable[Dict[str, Any]], output_path: Path, append: bool = False
+) -> Path:
+    """
+    Writes extraction records to a spill log so they can be re-exported later
+    without re-running extraction.
+    """
+    with RecordLogWriter(output_path, append=append) as writer:
+        for record in records:
+            writer.write(record)
+
+    logger.debug("Spilled %d record(s) to %s", writer.count, output_path)
+    return Path(output_path)
+
+def completed_urls(log: RecordLog) -> Set[str]:
+    """
+    Returns the URLs that need no further extraction: their most recent
+    record either succeeded or failed in a way retrying will not fix.
+    """
+    return {
+        url
+        for url, position in log.latest_positions().items()
+        if log.status(position) != STATUS_RETRYABLE
+    }
+
+def iter_latest_records(
+    log: RecordLog, urls: Optional[Iterable[str]] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Yields the most recent record for each URL. With 'urls', records follow
+    that order and URLs missing from the log are skipped; otherwise they
+    follow the order in which URLs first appear in the log.
+    """
+    latest = log.latest_positions()
+    for url in urls if urls is not None else list(latest):
+        position = latest.get(url)
+        if position is not None:
+            yield log[position]
+
+def compact_spill(path: Path) -> int:
+    """
+    Drops entries superseded by a later entry for the same URL, copying the
+    kept entries without decoding them. Returns the number of entries
+    dropped.
+    """
+    path = Path(path)
+    tmp_path = path.with_name(path.name + ".tmp")
+
+    with RecordLog(path) as log:
+        latest = log.latest_positions()
+        dropped = len(log) - len(latest)
+        if not dropped:
+            return 0
+        with RecordLogWriter(tmp_path) as writer:
+            for position in sorted(latest.values()):
+                writer.write_raw(*log.entry(position))
+
+    os.replace(index_path_for(tmp_path), index_path_for(path))
+    os.replace(tmp_path, path)
+    logger.info("Compacted %s: dropped %d superseded record(s)", path, dropped)
+    return dropped
+
+def merge_spills(inputs: Iterable[Path], output_path: Path) -> Path:
+    """
+    Concatenates several spill logs into one, copying encoded payloads
+    without decoding them. The output may be one of the inputs: it is only
+    replaced once the merged log is complete.
+    """
+    output_path = Path(output_path)
+    tmp_path = output_path.with_name(output_path.name + ".tmp")
+
+    with RecordLogWriter(tmp_path) as writer:
+        for path in inputs:
+            with RecordLog(path) as log:
+                for position in range(len(log)):
+                    writer.write_raw(*log.entry(position))
+
+    os.replace(index_path_for(tmp_path), index_path_for(output_path))
+    os.replace(tmp_path, output_path)
+    logger.debug("Merged %d record(s) into %s", writer.count, output_path)
+    return output_path
@@ -0,0 +1,247 @@
+import gc
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_SIZE_PATTERN = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*([kmgt]?)(i?b?)\s*$", re.IGNORECASE)
+_SIZE_UNITS = {"": 0, "k": 1, "m": 2, "g": 3, "t": 4}
+
+class PipelineAborted(RuntimeError):
+    """Raised in every stage once any stage of the pipeline has failed."""
+
+class StageQueue:
+    """
+    Bounded FIFO feeding one pipeline stage.
+
+    'put' blocks while the queue holds 'capacity' items, so a fast producer is
+    throttled to the pace of its consumer. The capacity can be lowered at
+    runtime (see MemoryGovernor) to shrink the amount of in-flight work.
+    Iterating the queue yields items until it is closed and drained.
+    """
+
+    def __init__(self, name: str, capacity: int) -> None:
+        if capacity < 1:
+            raise ValueError(f"Queue capacity must be at least 1, got {capacity}.")
+        self.name = name
+        self.base_capacity = capacity
+        self._capacity = capacity
+        self._items: Deque[Any] = deque()
+        self._cond = threading.Condition()
+        self._closed = False
+        self._aborted = False
+        self.max_depth = 0
+        self.blocked_puts = 0
+
+    @property
+    def depth(self) -> int:
+        return len(self._items)
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    def put(self, item: Any) -> None:
+        with self._cond:
+            if len(self._items) >= self._capacity:
+                self.blocked_puts += 1
+            while len(self._items) >= self._capacity and not self._aborted:
+                self._cond.wait()
+            if self._aborted:
+                raise PipelineAborted(f"Pipeline aborted while writing to '{self.name}'.")
+            self._items.append(item)
+            self.max_depth = max(self.max_depth, len(self._items))
+            self._cond.notify_all()
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def abort(self) -> None:
+        with self._cond:
+            self._aborted = True
+            self._cond.notify_all()
+
+    def resize(self, capacity: int) -> None:
+        with self._cond:
+            self._capacity = max(1, capacity)
+            self._cond.notify_all()
+
+    def __iter__(self) -> Iterator[Any]:
+        while True:
+            with self._cond:
+                while not self._items and not self._closed and not self._aborted:
+                    self._cond.wait()
+                if self._aborted:
+                    raise PipelineAborted(f"Pipeline aborted while reading from '{self.name}'.")
+                if not self._items:
+                    return
+                item = self._items.popleft()
+                self._cond.notify_all()
+            yield item
+
+def parse_memory_size(value: Any) -> int:
+    """
+    Parses sizes such as '1GiB', '800M', '512mb' or plain byte counts.
+    Units are binary (1K = 1024 bytes).
+    """
+    if isinstance(value, (int, float)):
+        return int(value)
+    match = _SIZE_PATTERN.match(str(value))
+    if not match:
+        raise ValueError(f"Invalid memory size '{value}'. Expected e.g. '1GiB' or '800M'.")
+    number, unit, _ = match.groups()
+    return int(float(number) * (1024 ** _SIZE_UNITS[unit.lower()]))
+
+def current_rss_bytes() -> Optional[int]:
+    """
+    Returns the resident set size of this process, or None when it cannot be
+    determined. Reads /proc on Linux and falls back to the peak RSS reported
+    by 'resource' elsewhere.
+    """
+    try:
+        with open("/proc/self/statm", "r", encoding="ascii") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes on Linux/BSD.
+    return peak if sys.platform == "darwin" else peak * 1024
+
+class MemoryGovernor:
+    """
+    Shrinks stage queue capacities as RSS approaches a memory budget.
+
+    Below 'soft_ratio' of the budget queues keep their configured capacity.
+    Between 'soft_ratio' and 'hard_ratio' capacities shrink linearly, and
+    above 'hard_ratio' every queue is limited to a single item, which blocks
+    producers until downstream stages catch up.
+
+    Once started, RSS is checked every 'interval' seconds on a dedicated
+    thread, independent of how often queue depths are reported.
+    """
+
+    def __init__(
+        self,
+        queues: List[StageQueue],
+        max_memory: int,
+        soft_ratio: float = 0.75,
+        hard_ratio: float = 0.9,
+        interval: float = 0.25,
+    ) -> None:
+        self.queues = queues
+        self.max_memory = max_memory
+        self.soft_limit = int(max_memory * soft_ratio)
+        self.hard_limit = int(max_memory * hard_ratio)
+        self.interval = interval
+        self.peak_rss = 0
+        self.last_rss: Optional[int] = None
+        self.throttle_events = 0
+        self._throttled = False
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="memory-governor", daemon=True)
+
+    def start(self) -> None:
+        self.check()
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.check()
+
+    def check(self) -> Optional[int]:
+        rss = current_rss_bytes()
+        if rss is None:
+            return None
+        self.last_rss = rss
+        self.peak_rss = max(self.peak_rss, rss)
+
+        if rss <= self.soft_limit:
+            scale = 1.0
+        elif rss >= self.hard_limit:
+            scale = 0.0
+        else:
+            scale = 1.0 - (rss - self.soft_limit) / (self.hard_limit - self.soft_limit)
+
+        throttled = scale < 1.0
+        if throttled and not self._throttled:
+            self.throttle_events += 1
+            logger.warning(
+                "RSS %.1f MiB is close to the %.1f MiB budget; shrinking in-flight work.",
+                rss / 2**20,
+                self.max_memory / 2**20,
+            )
+            gc.collect()
+        elif not throttled and self._throttled:
+            logger.info("RSS back under the soft limit; restoring queue capacities.")
+        self._throttled = throttled
+
+        for queue in self.queues:
+            queue.resize(int(queue.base_capacity * scale))
+        return rss
+
+class QueueDepthRecorder:
+    """
+    Samples queue depths (and the governor's latest RSS reading, if any) on
+    a background thread. Once 'max_samples' is reached, every other sample is
+    dropped and the interval doubles, so long runs stay bounded in memory.
+    """
+
+    def __init__(
+        self,
+        queues: List[StageQueue],
+        interval: float = 0.5,
+        governor: Optional[MemoryGovernor] = None,
+        max_samples: int = 1000,
+    ) -> None:
+        self.queues = queues
+        self.interval = interval
+        self.governor = governor
+        self.max_samples = max_samples
+        self.samples: List[Dict[str, Any]] = []
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="queue-depth-recorder", daemon=True)
+        self._started_at = 0.0
+
+    def start(self) -> None:
+        self._started_at = time.monotonic()
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+        self._sample()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def _sample(self) -> None:
+        sample: Dict[str, Any] = {
+            "elapsed_seconds": round(time.monotonic() - self._started_at, 3),
+            "depths": {q.name: q.depth for q in self.queues},
+        }
+        if self.governor is not None:
+            sample["rss_bytes"] = self.governor.last_rss
+        self.samples.append(sample)
+
+        if len(self.samples) > self.max_samples:
+            self.samples = self.samples[::2]
+            self.interval *= 2
@@ -0,0 +1,216 @@
+import logging
+import threading
+import time
+from collections import Counter, deque
+from typing import Any, Callable, Deque, Dict, Iterable, Optional
+
+from extractors.errors import TIMEOUT, UPSTREAM_ERROR
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Categories that reflect the health of a platform rather than a single URL.
+DEFAULT_TRIP_CATEGORIES = frozenset({TIMEOUT, UPSTREAM_ERROR})
+
+class CircuitBreaker:
+    """
+    Rolling-window circuit breaker for one platform.
+
+    While closed, the outcome of the last 'window' calls is tracked. Once at
+    least 'min_calls' have been made and the share of failures reaches
+    'failure_rate', the breaker opens and 'allow' returns False. After
+    'cooldown_seconds' a single probe call is allowed (half-open): success
+    closes the breaker, failure re-opens it for another cooldown.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_rate: float = 0.5,
+        min_calls: int = 5,
+        window: int = 20,
+        cooldown_seconds: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.name = name
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.cooldown_seconds = cooldown_seconds
+        self._clock = clock
+        self._outcomes: Deque[bool] = deque(maxlen=window)
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+        self.times_opened = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == OPEN and self._cooldown_elapsed():
+                return HALF_OPEN
+            return self._state
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self._state == CLOSED:
+                return True
+            if self._state == OPEN and self._cooldown_elapsed():
+                self._state = HALF_OPEN
+                self._probe_in_flight = False
+            if self._state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                logger.info("Circuit for %s is half-open; sending a probe.", self.name)
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._state == OPEN:
+                # A call admitted before the breaker opened; not a probe.
+                return
+            if self._state == HALF_OPEN:
+                logger.info("Circuit for %s closed after a successful probe.", self.name)
+                self._state = CLOSED
+                self._outcomes.clear()
+                self._probe_in_flight = False
+            self._outcomes.append(True)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._open("probe failed")
+                return
+            if self._state == OPEN:
+                return
+            self._outcomes.append(False)
+            failures = self._outcomes.count(False)
+            if (
+                self._state == CLOSED
+                and len(self._outcomes) >= self.min_calls
+                and failures / len(self._outcomes) >= self.failure_rate
+            ):
+                self._open(f"{failures}/{len(self._outcomes)} recent calls failed")
+
+    def _open(self, reason: str) -> None:
+        self._state = OPEN
+        self._opened_at = self._clock()
+        self._probe_in_flight = False
+        self.times_opened += 1
+        logger.warning(
+            "Circuit for %s opened (%s); failing its URLs fast for %.0fs.",
+            self.name,
+            reason,
+            self.cooldown_seconds,
+        )
+
+    def _cooldown_elapsed(self) -> bool:
+        return self._clock() - self._opened_at >= self.cooldown_seconds
+
+class CircuitBreakerBoard:
+    """
+    Lazily creates one CircuitBreaker per platform and routes call outcomes
+    to it. Only failures in 'trip_categories' count against a platform;
+    other failures (e.g. a single unparsable URL) count as the platform
+    having answered.
+    """
+
+    def __init__(
+        self,
+        trip_categories: Iterable[str] = DEFAULT_TRIP_CATEGORIES,
+        **breaker_options: Any,
+    ) -> None:
+        self.trip_categories = frozenset(trip_categories)
+        self._breaker_options = breaker_options
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls, settings: Dict[str, Any]) -> Optional["CircuitBreakerBoard"]:
+        options = dict(settings or {})
+        if not options.pop("enabled", True):
+            return None
+        trip_categories = options.pop("trip_categories", DEFAULT_TRIP_CATEGORIES)
+        return cls(trip_categories, **options)
+
+    def breaker(self, platform: str) -> CircuitBreaker:
+        with self._lock:
+            breaker = self._breakers.get(platform)
+            if breaker is None:
+                breaker = CircuitBreaker(platform, **self._breaker_options)
+                self._breakers[platform] = breaker
+            return breaker
+
+    def allow(self, platform: str) -> bool:
+        return self.breaker(platform).allow()
+
+    def record(self, platform: str, category: Optional[str]) -> None:
+        breaker = self.breaker(platform)
+        if category in self.trip_categories:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+
+    def states(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            breakers = list(self._breakers.values())
+        return {b.name: {"state": b.state, "times_opened": b.times_opened} for b in breakers}
+
+class FailureSummary:
+    """
+    Counts failed records by category and platform. 'consume' is a pipeline
+    sink, so the summary is built as records stream past the exporters.
+    """
+
+    def __init__(self) -> None:
+        self.total = 0
+        self.failed = 0
+        self.by_category: Counter = Counter()
+        self.by_platform: Dict[str, Counter] = {}
+        self.retryable = 0
+
+    def consume(self, records: Iterable[Dict[str, Any]]) -> None:
+        for record in records:
+            self.add(record)
+
+    def add(self, record: Dict[str, Any]) -> None:
+        self.total += 1
+        if not record.get("error"):
+            return
+        self.failed += 1
+        category = record.get("error_category") or "unknown"
+        self.by_category[category] += 1
+        platform = record.get("source") or "unknown"
+        self.by_platform.setdefault(platform, Counter())[category] += 1
+        if record.get("retryable"):
+            self.retryable += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "total": self.total,
+            "failed": self.failed,
+            "retryable": self.retryable,
+            "by_category": dict(self.by_category),
+            "by_platform": {p: dict(c) for p, c in self.by_platform.items()},
+        }
+
+    def log_summary(self) -> None:
+        if not self.failed:
+            logger.info("All %d record(s) extracted successfully.", self.total)
+            return
+        logger.warning(
+            "%d of %d record(s) failed (%d retryable): %s",
+            self.failed,
+            self.total,
+            self.retryable,
+            ", ".join(f"{c}={n}" for c, n in self.by_category.most_common()),
+        )
+        for platform, counts in sorted(self.by_platform.items()):
+            logger.info(
+                "  %s: %s",
+                platform,
+                ", ".join(f"{c}={n}" for c, n in counts.most_common()),
+            )
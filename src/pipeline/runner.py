@@ -0,0 +1,167 @@
+import logging
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from pipeline.backpressure import (
+    MemoryGovernor,
+    PipelineAborted,
+    QueueDepthRecorder,
+    StageQueue,
+)
+
+logger = logging.getLogger(__name__)
+
+Stage = Tuple[str, Callable[[Any], Any]]
+Sink = Callable[[Iterable[Dict[str, Any]]], Any]
+
+class PipelineReport:
+    """
+    Summary of a pipeline run: per-stage queue statistics and the sampled
+    queue depths over time.
+    """
+
+    def __init__(
+        self,
+        queues: List[StageQueue],
+        recorder: QueueDepthRecorder,
+        governor: Optional[MemoryGovernor],
+        processed: int,
+    ) -> None:
+        self.processed = processed
+        self.stages = {
+            q.name: {
+                "capacity": q.base_capacity,
+                "max_depth": q.max_depth,
+                "blocked_puts": q.blocked_puts,
+            }
+            for q in queues
+        }
+        self.samples = recorder.samples
+        self.sample_interval_seconds = recorder.interval
+        self.max_memory_bytes = governor.max_memory if governor else None
+        self.peak_rss_bytes = governor.peak_rss if governor else None
+        self.throttle_events = governor.throttle_events if governor else 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "processed": self.processed,
+            "max_memory_bytes": self.max_memory_bytes,
+            "peak_rss_bytes": self.peak_rss_bytes,
+            "throttle_events": self.throttle_events,
+            "stages": self.stages,
+            "sample_interval_seconds": self.sample_interval_seconds,
+            "samples": self.samples,
+        }
+
+    def log_summary(self) -> None:
+        for name, stats in self.stages.items():
+            logger.info(
+                "Stage %-14s capacity=%d max_depth=%d blocked_puts=%d",
+                name,
+                stats["capacity"],
+                stats["max_depth"],
+                stats["blocked_puts"],
+            )
+        if self.max_memory_bytes:
+            logger.info(
+                "Peak RSS %.1f MiB of %.1f MiB budget (%d throttle event(s))",
+                (self.peak_rss_bytes or 0) / 2**20,
+                self.max_memory_bytes / 2**20,
+                self.throttle_events,
+            )
+
+def run_pipeline(
+    items: Iterable[Any],
+    stages: List[Stage],
+    sinks: Dict[str, Sink],
+    queue_size: int = 64,
+    max_memory: Optional[int] = None,
+    sample_interval: float = 0.5,
+) -> PipelineReport:
+    """
+    Streams items through 'stages' and fans the results out to 'sinks'.
+
+    Every stage runs on its own thread and reads from a bounded StageQueue,
+    so memory use is capped at roughly 'queue_size' items per stage no
+    matter how many items are fed in. Each sink receives an iterable of
+    results and runs on its own thread behind its own queue; a slow sink
+    blocks the stages before it rather than buffering without bound.
+
+    When 'max_memory' is set, queue capacities shrink as RSS approaches the
+    budget. Any exception in a stage or sink aborts the whole pipeline and is
+    re-raised here.
+    """
+    stage_queues = [StageQueue(name, queue_size) for name, _ in stages]
+    fanout_queue = StageQueue("export", queue_size)
+    sink_queues = {name: StageQueue(f"export:{name}", queue_size) for name in sinks}
+    all_queues = stage_queues + [fanout_queue] + list(sink_queues.values())
+
+    governor = MemoryGovernor(all_queues, max_memory) if max_memory else None
+    recorder = QueueDepthRecorder(all_queues, interval=sample_interval, governor=governor)
+
+    errors: List[BaseException] = []
+    errors_lock = threading.Lock()
+    counter = {"processed": 0}
+
+    def abort(exc: BaseException) -> None:
+        with errors_lock:
+            if not isinstance(exc, PipelineAborted):
+                errors.append(exc)
+        for queue in all_queues:
+            queue.abort()
+
+    def intake() -> None:
+        target = stage_queues[0] if stage_queues else fanout_queue
+        for item in items:
+            target.put(item)
+        target.close()
+
+    def stage_worker(index: int, fn: Callable[[Any], Any]) -> None:
+        source = stage_queues[index]
+        target = stage_queues[index + 1] if index + 1 < len(stage_queues) else fanout_queue
+        for item in source:
+            target.put(fn(item))
+        target.close()
+
+    def fanout() -> None:
+        for record in fanout_queue:
+            counter["processed"] += 1
+            for queue in sink_queues.values():
+                queue.put(record)
+        for queue in sink_queues.values():
+            queue.close()
+
+    def sink_worker(name: str, sink: Sink) -> None:
+        sink(iter(sink_queues[name]))
+        logger.debug("Sink %s finished", name)
+
+    def guarded(target: Callable[..., None], *args: Any) -> Callable[[], None]:
+        def run() -> None:
+            try:
+                target(*args)
+            except BaseException as exc:
+                abort(exc)
+        return run
+
+    threads = [threading.Thread(target=guarded(intake), name="intake")]
+    for index, (name, fn) in enumerate(stages):
+        threads.append(threading.Thread(target=guarded(stage_worker, index, fn), name=name))
+    threads.append(threading.Thread(target=guarded(fanout), name="export"))
+    for name, sink in sinks.items():
+        threads.append(threading.Thread(target=guarded(sink_worker, name, sink), name=f"export:{name}"))
+
+    if governor is not None:
+        governor.start()
+    recorder.start()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    recorder.stop()
+    if governor is not None:
+        governor.stop()
+
+    if errors:
+        raise errors[0]
+
+    return PipelineReport(all_queues, recorder, governor, counter["processed"])
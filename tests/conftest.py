@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# Modules under src/ import each other as top-level packages (see src/main.py).
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
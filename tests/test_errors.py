@@ -0,0 +1,33 @@
+import socket
+import ssl
+import urllib.error
+
+from extractors.errors import (
+    INTERNAL_ERROR,
+    PARSE_ERROR,
+    RETRYABLE_CATEGORIES,
+    TIMEOUT,
+    UPSTREAM_ERROR,
+    ParseError,
+    classify_exception,
+)
+
+def test_extraction_errors_keep_their_category():
+    assert classify_exception(ParseError("bad id")) == PARSE_ERROR
+
+def test_standard_library_network_errors():
+    assert classify_exception(socket.timeout("slow")) == TIMEOUT
+    assert classify_exception(ConnectionResetError()) == UPSTREAM_ERROR
+    assert classify_exception(socket.gaierror(-2, "Name or service not known")) == UPSTREAM_ERROR
+    assert classify_exception(ssl.SSLError("handshake failed")) == UPSTREAM_ERROR
+    assert classify_exception(urllib.error.URLError("refused")) == UPSTREAM_ERROR
+    http_error = urllib.error.HTTPError("https://x", 503, "Unavailable", {}, None)
+    assert classify_exception(http_error) == UPSTREAM_ERROR
+
+def test_wrapped_timeout_is_a_timeout():
+    assert classify_exception(urllib.error.URLError(socket.timeout("timed out"))) == TIMEOUT
+
+def test_bugs_are_internal_errors_and_retried_on_resume():
+    assert classify_exception(ValueError("invalid literal for int()")) == INTERNAL_ERROR
+    assert classify_exception(FileNotFoundError("missing")) == INTERNAL_ERROR
+    assert INTERNAL_ERROR in RETRYABLE_CATEGORIES
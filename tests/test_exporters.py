@@ -0,0 +1,65 @@
+import csv
+import json
+
+import pytest
+
+from outputs.exporter_csv import CSV_COLUMNS, export_to_csv
+from outputs.exporter_json import export_to_json
+from pipeline.backpressure import PipelineAborted
+
+def _record(idx, **overrides):
+    record = {
+        "url": f"https://www.tiktok.com/@user/video/{idx}",
+        "source": "tiktok",
+        "author": "user",
+        "title": f"TikTok video by user {idx}",
+        "thumbnail": "",
+        "duration": 1000,
+        "medias": [{"url": "https://dummy.tiktokcdn.com/1.mp4", "quality": "hd", "type": "video"}],
+        "type": "multiple",
+        "error": False,
+    }
+    record.update(overrides)
+    return record
+
+def _failed(idx):
+    return _record(
+        idx,
+        medias=[],
+        error=True,
+        error_category="timeout",
+        error_message="timed out",
+        retryable=True,
+    )
+
+def _read_csv(path):
+    with path.open(encoding="utf-8", newline="") as f:
+        return list(csv.reader(f))
+
+def test_csv_header_is_fixed_when_first_record_failed(tmp_path):
+    failed_first = export_to_csv([_failed(0), _record(1)], tmp_path / "a.csv")
+    ok_first = export_to_csv([_record(1), _failed(0)], tmp_path / "b.csv")
+    empty = export_to_csv([], tmp_path / "c.csv")
+
+    for path in (failed_first, ok_first, empty):
+        assert _read_csv(path)[0] == CSV_COLUMNS
+
+    rows = _read_csv(failed_first)
+    assert rows[1][CSV_COLUMNS.index("error_category")] == "timeout"
+    assert rows[2][CSV_COLUMNS.index("error_category")] == ""
+
+def test_aborted_export_keeps_previous_output(tmp_path):
+    path = export_to_json([_record(0)], tmp_path / "out.json")
+    export_to_csv([_record(0)], tmp_path / "out.csv")
+    previous = {p.name: p.read_text(encoding="utf-8") for p in tmp_path.iterdir()}
+
+    def aborted_stream():
+        yield _record(1)
+        raise PipelineAborted("stage failed")
+
+    for exporter, name in ((export_to_json, "out.json"), (export_to_csv, "out.csv")):
+        with pytest.raises(PipelineAborted):
+            exporter(aborted_stream(), tmp_path / name)
+
+    assert {p.name: p.read_text(encoding="utf-8") for p in tmp_path.iterdir()} == previous
+    assert json.loads(path.read_text(encoding="utf-8")) == [_record(0)]
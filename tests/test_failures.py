@@ -0,0 +1,153 @@
+from extractors.errors import PARSE_ERROR, TIMEOUT, UPSTREAM_ERROR
+from pipeline.failures import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    CircuitBreakerBoard,
+    FailureSummary,
+)
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+def _breaker(clock, **options):
+    options = {"failure_rate": 0.5, "min_calls": 4, "window": 6, "cooldown_seconds": 10, **options}
+    return CircuitBreaker("tiktok", clock=clock, **options)
+
+def test_breaker_waits_for_min_calls():
+    breaker = _breaker(FakeClock())
+    for _ in range(3):
+        breaker.record_failure()
+    assert breaker.state == CLOSED
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+    assert breaker.times_opened == 1
+
+def test_breaker_opens_at_failure_rate_within_window():
+    breaker = _breaker(FakeClock())
+    for _ in range(4):
+        breaker.record_success()
+    for _ in range(3):
+        breaker.record_failure()
+    # 3 of the last 6 calls failed (one success fell out of the window).
+    assert breaker.state == OPEN
+
+def test_breaker_window_forgets_old_failures():
+    breaker = _breaker(FakeClock(), failure_rate=0.6)
+    breaker.record_failure()
+    breaker.record_failure()
+    for _ in range(6):
+        breaker.record_success()
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_failure()
+    # Only 3 of the last 6 calls failed, below the 60% rate.
+    assert breaker.state == CLOSED
+
+def test_half_open_probe_success_closes():
+    clock = FakeClock()
+    breaker = _breaker(clock)
+    for _ in range(4):
+        breaker.record_failure()
+
+    clock.now = 9.9
+    assert not breaker.allow()
+    clock.now = 10
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow()
+    # Only one probe at a time.
+    assert not breaker.allow()
+
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    assert breaker.allow()
+    # The failures that opened the breaker no longer count.
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+
+def test_half_open_probe_failure_reopens():
+    clock = FakeClock()
+    breaker = _breaker(clock)
+    for _ in range(4):
+        breaker.record_failure()
+
+    clock.now = 10
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert breaker.times_opened == 2
+    assert not breaker.allow()
+
+    clock.now = 19.9
+    assert not breaker.allow()
+    clock.now = 20
+    assert breaker.allow()
+
+def test_outcomes_while_open_are_ignored():
+    clock = FakeClock()
+    breaker = _breaker(clock)
+    for _ in range(4):
+        breaker.record_failure()
+    # Calls admitted before the breaker opened finish late.
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert breaker.times_opened == 1
+
+def test_board_only_trips_on_trip_categories():
+    clock = FakeClock()
+    board = CircuitBreakerBoard(min_calls=2, window=4, cooldown_seconds=10, clock=clock)
+    for _ in range(5):
+        board.record("youtube", PARSE_ERROR)
+        board.record("youtube", None)
+    assert board.allow("youtube")
+
+    board.record("tiktok", TIMEOUT)
+    board.record("tiktok", UPSTREAM_ERROR)
+    assert not board.allow("tiktok")
+    assert board.allow("youtube")
+    assert board.states() == {
+        "youtube": {"state": CLOSED, "times_opened": 0},
+        "tiktok": {"state": OPEN, "times_opened": 1},
+    }
+
+def test_board_from_settings():
+    assert CircuitBreakerBoard.from_settings({"enabled": False}) is None
+
+    board = CircuitBreakerBoard.from_settings(
+        {"trip_categories": [PARSE_ERROR], "min_calls": 1, "failure_rate": 0.6}
+    )
+    board.record("instagram", TIMEOUT)
+    assert board.allow("instagram")
+    board.record("instagram", PARSE_ERROR)
+    board.record("instagram", PARSE_ERROR)
+    assert board.breaker("instagram").state == OPEN
+
+def test_failure_summary():
+    summary = FailureSummary()
+    summary.consume(
+        [
+            {"url": "a", "source": "tiktok", "error": False},
+            {"url": "b", "source": "tiktok", "error": True, "error_category": TIMEOUT, "retryable": True},
+            {"url": "c", "source": "youtube", "error": True, "error_category": PARSE_ERROR, "retryable": False},
+            {"url": "d", "error": True},
+        ]
+    )
+    assert summary.to_dict() == {
+        "total": 4,
+        "failed": 3,
+        "retryable": 1,
+        "by_category": {TIMEOUT: 1, PARSE_ERROR: 1, "unknown": 1},
+        "by_platform": {
+            "tiktok": {TIMEOUT: 1},
+            "youtube": {PARSE_ERROR: 1},
+            "unknown": {"unknown": 1},
+        },
+    }
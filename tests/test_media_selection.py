@@ -0,0 +1,116 @@
+import pytest
+
+from extractors.errors import UnsupportedError
+from extractors.generic_extractor import GenericExtractor
+from extractors.media_selection import MediaSelection
+
+@pytest.mark.parametrize("spec", ["audio", "video", "image", "best", "best+audio,max:480p"])
+def test_untyped_generic_variants_pass_every_type_filter(spec):
+    record = GenericExtractor("spotify").extract(
+        "https://open.spotify.com/track/abc", MediaSelection.parse(spec)
+    )
+    assert [m["type"] for m in record["medias"]] == ["multiple"]
+    assert record["type"] == "multiple"
+
+# Mirrors the variant lists built by the YouTube, TikTok and Instagram extractors.
+YOUTUBE = [
+    {"quality": "1080p", "extension": "mp4", "type": "video"},
+    {"quality": "720p", "extension": "mp4", "type": "video"},
+    {"quality": "audio", "extension": "mp3", "type": "audio"},
+]
+TIKTOK = [
+    {"quality": "hd_no_watermark", "extension": "mp4", "type": "video"},
+    {"quality": "no_watermark", "extension": "mp4", "type": "video"},
+    {"quality": "audio", "extension": "mp3", "type": "audio"},
+]
+SLIDESHOW = [
+    {"name": f"image_{idx}", "quality": "standard", "extension": "jpg", "type": "image"}
+    for idx in range(1, 4)
+]
+
+def _qualities(variants):
+    return [v.get("name", v["quality"]) for v in variants]
+
+def test_parse_defaults_to_all():
+    for spec in (None, "", " , "):
+        selection = MediaSelection.parse(spec)
+        assert selection.terms == {"all"}
+        assert selection.keeps_everything
+
+def test_parse_terms_and_height_cap():
+    selection = MediaSelection.parse(" Best + Audio , MAX:720p")
+    assert selection.terms == {"best", "audio"}
+    assert selection.max_height == 720
+    assert not selection.keeps_everything
+    assert repr(selection) == "MediaSelection(audio+best, max:720p)"
+
+    assert MediaSelection.parse("max=1080").max_height == 1080
+    assert MediaSelection.parse("max:480").terms == {"all"}
+
+@pytest.mark.parametrize("spec", ["hd", "best+", "video+4k", "max:72p"])
+def test_parse_rejects_unknown_terms(spec):
+    with pytest.raises(ValueError, match="Unknown media selection term"):
+        MediaSelection.parse(spec)
+
+@pytest.mark.parametrize(
+    "spec, expected",
+    [
+        ("all", ["1080p", "720p", "audio"]),
+        ("best", ["1080p"]),
+        ("best+audio", ["1080p", "audio"]),
+        ("video", ["1080p", "720p"]),
+        ("audio", ["audio"]),
+        ("max:720p", ["720p", "audio"]),
+        ("best,max:720p", ["720p"]),
+        # Every video is over the cap: the smallest one is kept.
+        ("max:480p", ["720p", "audio"]),
+        ("best,max:480p", ["720p"]),
+        ("video,max:480p", ["720p"]),
+        ("audio,max:480p", ["audio"]),
+    ],
+)
+def test_select_youtube_variants(spec, expected):
+    assert _qualities(MediaSelection.parse(spec).select(YOUTUBE)) == expected
+
+@pytest.mark.parametrize(
+    "spec, expected",
+    [
+        ("best", ["hd_no_watermark"]),
+        ("best+audio", ["hd_no_watermark", "audio"]),
+        ("video", ["hd_no_watermark", "no_watermark"]),
+        # TikTok qualities carry no height, so the cap cannot drop them.
+        ("max:480p", ["hd_no_watermark", "no_watermark", "audio"]),
+    ],
+)
+def test_select_tiktok_variants(spec, expected):
+    assert _qualities(MediaSelection.parse(spec).select(TIKTOK)) == expected
+
+def test_best_without_video_keeps_every_image():
+    assert _qualities(MediaSelection.parse("best").select(SLIDESHOW)) == [
+        "image_1",
+        "image_2",
+        "image_3",
+    ]
+    assert _qualities(MediaSelection.parse("best+audio").select(SLIDESHOW)) == [
+        "image_1",
+        "image_2",
+        "image_3",
+    ]
+
+@pytest.mark.parametrize("spec, variants", [("image", YOUTUBE), ("video", SLIDESHOW), ("audio", SLIDESHOW)])
+def test_select_without_match_raises(spec, variants):
+    with pytest.raises(UnsupportedError, match="matched none"):
+        MediaSelection.parse(spec).select(variants)
+
+def test_select_nothing_from_nothing():
+    assert MediaSelection.parse("video").select([]) == []
+
+def test_record_type():
+    youtube_audio = MediaSelection.parse("audio").select(YOUTUBE)
+    assert MediaSelection.parse("audio").record_type(youtube_audio, "multiple") == "audio"
+
+    best_audio = MediaSelection.parse("best+audio")
+    assert best_audio.record_type(best_audio.select(YOUTUBE), "multiple") == "multiple"
+    assert best_audio.record_type([], "multiple") == "multiple"
+    # 'all' never changes the extractor's own type.
+    assert MediaSelection.parse("all").record_type(SLIDESHOW, "slideshow") == "slideshow"
@@ -0,0 +1,124 @@
+import threading
+import time
+
+import pytest
+
+from pipeline import backpressure
+from pipeline.backpressure import (
+    MemoryGovernor,
+    PipelineAborted,
+    StageQueue,
+    parse_memory_size,
+)
+from pipeline.runner import run_pipeline
+
+MiB = 2**20
+
+def test_parse_memory_size():
+    assert parse_memory_size("1GiB") == 2**30
+    assert parse_memory_size("800M") == 800 * MiB
+    assert parse_memory_size(" 512 mb ") == 512 * MiB
+    assert parse_memory_size("1.5k") == 1536
+    assert parse_memory_size("4096") == 4096
+    assert parse_memory_size(2048) == 2048
+    for value in ("", "lots", "1 PiB", "-1G"):
+        with pytest.raises(ValueError):
+            parse_memory_size(value)
+
+def test_stage_queue_rejects_zero_capacity():
+    with pytest.raises(ValueError):
+        StageQueue("extract", 0)
+
+def test_pipeline_runs_stages_in_order_and_fans_out():
+    collected = {"a": [], "b": []}
+    report = run_pipeline(
+        range(20),
+        [("double", lambda x: x * 2), ("inc", lambda x: x + 1)],
+        {"a": collected["a"].extend, "b": collected["b"].extend},
+        queue_size=2,
+    )
+    expected = [x * 2 + 1 for x in range(20)]
+    assert collected == {"a": expected, "b": expected}
+    assert report.processed == 20
+    assert all(stats["max_depth"] <= 2 for stats in report.stages.values())
+
+def test_slow_sink_blocks_producers():
+    def slow_sink(records):
+        for _ in records:
+            time.sleep(0.002)
+
+    report = run_pipeline(range(50), [("extract", lambda x: x)], {"slow": slow_sink}, queue_size=2)
+    assert report.stages["extract"]["blocked_puts"] > 0
+    assert report.stages["export:slow"]["max_depth"] <= 2
+
+@pytest.mark.parametrize("failing", ["stage", "sink"])
+def test_failure_aborts_every_thread_and_is_reraised(failing):
+    def stage(x):
+        if failing == "stage" and x == 5:
+            raise RuntimeError("stage broke")
+        return x
+
+    def bad_sink(records):
+        for record in records:
+            if failing == "sink" and record == 5:
+                raise RuntimeError("sink broke")
+
+    def endless():
+        # Without an abort the intake would block on a full queue forever.
+        n = 0
+        while True:
+            yield n
+            n += 1
+
+    threads_before = threading.active_count()
+    with pytest.raises(RuntimeError, match=f"{failing} broke"):
+        run_pipeline(endless(), [("extract", stage)], {"bad": bad_sink, "ok": list}, queue_size=2)
+    assert threading.active_count() == threads_before
+
+def test_aborted_queue_unblocks_put():
+    queue = StageQueue("extract", 1)
+    queue.put(1)
+    errors = []
+
+    def put():
+        try:
+            queue.put(2)
+        except PipelineAborted as exc:
+            errors.append(exc)
+
+    thread = threading.Thread(target=put)
+    thread.start()
+    time.sleep(0.01)
+    queue.abort()
+    thread.join(1)
+    assert not thread.is_alive()
+    assert len(errors) == 1
+
+def test_memory_governor_shrinks_queues_between_limits(monkeypatch):
+    queues = [StageQueue("extract", 100), StageQueue("export", 10)]
+    governor = MemoryGovernor(queues, 100 * MiB, soft_ratio=0.5, hard_ratio=0.9)
+
+    def check_at(rss):
+        monkeypatch.setattr(backpressure, "current_rss_bytes", lambda: rss)
+        governor.check()
+        return [q.capacity for q in queues]
+
+    assert check_at(40 * MiB) == [100, 10]
+    assert governor.throttle_events == 0
+    # A quarter of the way from the soft to the hard limit.
+    assert check_at(60 * MiB) == [75, 7]
+    assert check_at(80 * MiB) == [25, 2]
+    assert check_at(95 * MiB) == [1, 1]
+    assert governor.throttle_events == 1
+    assert check_at(30 * MiB) == [100, 10]
+    assert check_at(70 * MiB) == [50, 5]
+    assert governor.throttle_events == 2
+    assert governor.peak_rss == 95 * MiB
+    assert governor.last_rss == 70 * MiB
+
+def test_memory_governor_without_rss(monkeypatch):
+    monkeypatch.setattr(backpressure, "current_rss_bytes", lambda: None)
+    queue = StageQueue("extract", 8)
+    governor = MemoryGovernor([queue], 100 * MiB)
+    assert governor.check() is None
+    assert queue.capacity == 8
@@ -0,0 +1,107 @@
+import pytest
+
+from extractors import registry as registry_module
+from extractors.generic_extractor import GenericExtractor
+from extractors.registry import ExtractorRegistry, _build_default_registry
+from extractors.tiktok_extractor import TikTokExtractor
+from extractors.youtube_extractor import YouTubeExtractor
+
+class FakeEntryPoint:
+    def __init__(self, name, target):
+        self.name = name
+        self._target = target
+
+    def load(self):
+        if isinstance(self._target, Exception):
+            raise self._target
+        return self._target
+
+class PluginTikTok:
+    source_name = "tiktok"
+    hosts = ("tiktok.example",)
+
+    def extract(self, url, selection=None):
+        return {"url": url, "source": "plugin"}
+
+class PluginVimeo:
+    source_name = "vimeo"
+    hosts = ("vimeo.com",)
+
+    def extract(self, url, selection=None):
+        return {"url": url, "source": "vimeo"}
+
+@pytest.fixture
+def plugins(monkeypatch):
+    installed = []
+
+    def fake_entry_points(group):
+        assert group == registry_module.ENTRY_POINT_GROUP
+        return list(installed)
+
+    monkeypatch.setattr(registry_module, "entry_points", fake_entry_points)
+    return installed
+
+@pytest.mark.parametrize(
+    "url, platform",
+    [
+        ("https://www.tiktok.com/@user/video/1", "tiktok"),
+        ("https://vm.tiktok.com/ZMabc/", "tiktok"),
+        ("https://WWW.TikTok.com./@user/video/1", "tiktok"),
+        ("https://youtu.be/abc", "youtube"),
+        ("https://m.youtube.com/watch?v=abc", "youtube"),
+        ("https://fb.watch/xyz", "facebook"),
+        ("https://tiktok.com.evil.net/@user/video/1", None),
+        ("https://nottiktok.com/@user/video/1", None),
+        ("not a url", None),
+    ],
+)
+def test_platform_for_url_matches_host_suffixes(plugins, url, platform):
+    assert _build_default_registry().platform_for_url(url) == platform
+
+def test_instances_are_cached_per_platform(plugins):
+    registry = _build_default_registry()
+    tiktok = registry.for_url("https://www.tiktok.com/@user/video/1")
+    assert isinstance(tiktok, TikTokExtractor)
+    assert registry.for_url("https://vm.tiktok.com/ZMabc/") is tiktok
+    assert isinstance(registry.get("youtube"), YouTubeExtractor)
+
+    unknown = registry.for_url("https://example.org/video")
+    assert isinstance(unknown, GenericExtractor)
+    assert unknown.source_name == "unknown"
+    assert registry.get(None) is unknown
+    assert registry.get("reddit").source_name == "reddit"
+
+def test_plugin_overrides_builtin_on_first_get(plugins):
+    plugins.append(FakeEntryPoint("tiktok", PluginTikTok))
+    registry = _build_default_registry()
+
+    # get() alone must load plugins before handing out a cached built-in.
+    assert isinstance(registry.get("tiktok"), PluginTikTok)
+    assert registry.platform_for_url("https://tiktok.example/v/1") == "tiktok"
+    # The replaced extractor's hosts are not inherited.
+    assert registry.platform_for_url("https://www.tiktok.com/@user/video/1") is None
+
+def test_plugin_adds_platform_and_broken_plugins_are_skipped(plugins):
+    plugins.append(FakeEntryPoint("broken", ImportError("missing dependency")))
+    plugins.append(FakeEntryPoint("vimeo", PluginVimeo))
+    registry = _build_default_registry()
+
+    assert registry.platform_for_url("https://player.vimeo.com/video/1") == "vimeo"
+    assert "vimeo" in registry.platforms
+    assert "broken" not in registry.platforms
+
+def test_register_replacing_platform_without_hosts_keeps_them():
+    registry = ExtractorRegistry(entry_point_group=None)
+    registry.register(TikTokExtractor)
+    registry.register(lambda: "replacement", platform="tiktok", hosts=())
+    assert registry.platform_for_host("vm.tiktok.com") == "tiktok"
+    assert registry.get("tiktok") == "replacement"
+
+def test_register_requires_platform_name():
+    with pytest.raises(ValueError):
+        ExtractorRegistry(entry_point_group=None).register(lambda: None)
+
+def test_parse_id_uses_platform_extractor(plugins):
+    registry = _build_default_registry()
+    assert registry.parse_id("https://www.youtube.com/watch?v=abc123") == "abc123"
+    assert registry.parse_id("https://example.org/video") == "https://example.org/video"
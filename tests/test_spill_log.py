@@ -0,0 +1,165 @@
+from outputs.spill_log import (
+    STATUS_OK,
+    STATUS_RETRYABLE,
+    RecordLog,
+    RecordLogWriter,
+    compact_spill,
+    completed_urls,
+    decode_record,
+    encode_record,
+    export_to_spill,
+    index_path_for,
+    iter_latest_records,
+    merge_spills,
+)
+
+def _record(idx):
+    return {
+        "url": f"https://www.youtube.com/watch?v=id{idx}",
+        "source": "youtube",
+        "author": "channel_ü😀",
+        "title": f"YouTube video id{idx}",
+        "thumbnail": "",
+        "duration": 120000 + idx,
+        "medias": [
+            {"url": "https://youtube.com/watch?v=x&fmt=mp4_720p", "quality": "720p", "extension": "mp4", "type": "video"},
+        ],
+        "type": "multiple",
+        "error": False,
+        "ratio": 1.5,
+        "missing": None,
+    }
+
+def test_encode_decode_round_trip():
+    record = _record(1)
+    assert decode_record(encode_record(record)) == record
+
+def test_spill_round_trip_with_random_access(tmp_path):
+    path = tmp_path / "out.spill"
+    records = [_record(i) for i in range(5)]
+    export_to_spill(records, path)
+
+    with RecordLog(path) as log:
+        assert len(log) == 5
+        assert log[3] == records[3]
+        assert log[-1] == records[-1]
+        assert list(log) == records
+
+def test_empty_spill(tmp_path):
+    path = tmp_path / "empty.spill"
+    export_to_spill([], path)
+
+    with RecordLog(path) as log:
+        assert len(log) == 0
+        assert list(log) == []
+
+def test_repair_index_after_truncated_write(tmp_path):
+    path = tmp_path / "out.spill"
+    records = [_record(i) for i in range(3)]
+    export_to_spill(records, path)
+    intact_size = path.stat().st_size
+
+    # Simulate a crash midway through a fourth entry whose index was never written.
+    with path.open("ab") as f:
+        f.write(b"\x40\x00\x00\x00partial")
+
+    # Reading skips the partial entry without touching the file...
+    with RecordLog(path) as log:
+        assert list(log) == records
+    assert path.stat().st_size > intact_size
+
+    # ...and appending truncates it before writing.
+    export_to_spill([_record(3)], path, append=True)
+    with RecordLog(path) as log:
+        assert list(log) == records + [_record(3)]
+
+def test_reading_does_not_disturb_a_running_writer(tmp_path):
+    path = tmp_path / "out.spill"
+    records = [_record(i) for i in range(3)]
+
+    with RecordLogWriter(path) as writer:
+        writer.write(records[0])
+        writer._log.flush()
+        # Another process opens the log while the writer is mid-entry.
+        writer._log.write(b"\x40\x00")
+        writer._log.flush()
+        with RecordLog(path) as log:
+            assert list(log) == records[:1]
+        writer._log.seek(-2, 1)
+        writer.write(records[1])
+        writer.write(records[2])
+
+    with RecordLog(path) as log:
+        assert list(log) == records
+
+def test_repair_index_when_index_missing(tmp_path):
+    path = tmp_path / "out.spill"
+    records = [_record(i) for i in range(4)]
+    export_to_spill(records, path)
+    index_path_for(path).unlink()
+
+    with RecordLog(path) as log:
+        assert list(log) == records
+
+def test_append_extends_log(tmp_path):
+    path = tmp_path / "out.spill"
+    export_to_spill([_record(0)], path)
+    export_to_spill([_record(1)], path, append=True)
+
+    with RecordLog(path) as log:
+        assert [r["url"] for r in log] == [_record(0)["url"], _record(1)["url"]]
+
+def test_entry_headers_carry_url_and_status(tmp_path):
+    path = tmp_path / "out.spill"
+    failed = dict(_record(1), error=True, retryable=True)
+    export_to_spill([_record(0), failed], path)
+
+    with RecordLog(path) as log:
+        assert log.url(1) == failed["url"]
+        assert log.status(0) == STATUS_OK
+        assert log.status(1) == STATUS_RETRYABLE
+
+def test_resume_lookups_use_latest_entry(tmp_path):
+    path = tmp_path / "out.spill"
+    first = dict(_record(0), error=True, retryable=True)
+    export_to_spill([first, _record(1)], path)
+    export_to_spill([_record(0)], path, append=True)
+
+    with RecordLog(path) as log:
+        assert completed_urls(log) == {_record(0)["url"], _record(1)["url"]}
+        assert list(iter_latest_records(log)) == [_record(0), _record(1)]
+
+def test_compact_drops_superseded_entries(tmp_path):
+    path = tmp_path / "out.spill"
+    failed = dict(_record(0), error=True, retryable=True)
+    export_to_spill([failed, _record(1)], path)
+    export_to_spill([_record(0)], path, append=True)
+
+    assert compact_spill(path) == 1
+    assert compact_spill(path) == 0
+    with RecordLog(path) as log:
+        assert list(log) == [_record(1), _record(0)]
+
+def test_completed_urls_skips_only_retryable_failures(tmp_path):
+    path = tmp_path / "out.spill"
+    retryable = dict(_record(0), error=True, retryable=True)
+    permanent = dict(_record(1), error=True, retryable=False)
+    export_to_spill([retryable, permanent, _record(2)], path)
+
+    with RecordLog(path) as log:
+        assert completed_urls(log) == {_record(1)["url"], _record(2)["url"]}
+
+def test_merge_spills_keeps_latest_record_per_url(tmp_path):
+    first = tmp_path / "first.spill"
+    second = tmp_path / "second.spill"
+    failed = dict(_record(0), error=True, retryable=True)
+    export_to_spill([failed, _record(1)], first)
+    export_to_spill([_record(0), _record(2)], second)
+
+    # Merging into one of the inputs must not read a half-written output.
+    merge_spills([first, second], first)
+
+    with RecordLog(first) as log:
+        assert len(log) == 4
+        assert list(iter_latest_records(log)) == [_record(0), _record(1), _record(2)]
+    assert not (tmp_path / "first.spill.tmp").exists()